@@ -1,10 +1,14 @@
 """
 Art Stuff - A place to discover cool art stuff.
 """
+import json
 import webbrowser
 import threading
 from functools import wraps
-from flask import Flask, render_template, request, jsonify, redirect, url_for, g
+from flask import (
+    Flask, Response, render_template, request, jsonify, redirect, url_for, g,
+    send_file, stream_with_context
+)
 
 # Use Supabase for cloud database (comment out and use 'database' for local SQLite)
 import supabase_db as db
@@ -12,6 +16,9 @@ import supabase_db as db
 
 import museum_apis as api
 import categories
+import image_proxy
+import image_urls
+import jwt_auth
 
 app = Flask(__name__)
 app.config['JSON_SORT_KEYS'] = False
@@ -19,6 +26,11 @@ app.config['JSON_SORT_KEYS'] = False
 # Initialize database on startup
 db.init_db()
 
+# Load the Rijksmuseum catalogue and spelling index in the background so
+# requests never wait on them
+api.warm_rijks_paintings()
+api.warm_spelling_index()
+
 
 # ============================================
 # AUTH HELPERS
@@ -29,10 +41,22 @@ def get_current_user():
     auth_header = request.headers.get('Authorization', '')
     if auth_header.startswith('Bearer '):
         token = auth_header[7:]
-        return db.get_user_from_token(token)
+        # Verified locally when possible; Supabase Auth is only asked about
+        # tokens we have no key for
+        user = jwt_auth.get_user(token, fallback=db.get_user_from_token)
+        if user:
+            # This request's queries run as the user (row level security)
+            db.set_request_user(token)
+        return user
     return None
 
 
+@app.teardown_request
+def clear_request_user(exc=None):
+    """Stop a reused worker thread carrying the last request's user."""
+    db.set_request_user(None)
+
+
 def require_auth(f):
     """Decorator to require authentication."""
     @wraps(f)
@@ -89,6 +113,7 @@ def api_logout():
     """Sign out a user."""
     auth_header = request.headers.get('Authorization', '')
     token = auth_header[7:] if auth_header.startswith('Bearer ') else None
+    jwt_auth.forget(token)
     result = db.sign_out(token)
     return jsonify(result)
 
@@ -120,6 +145,7 @@ def delete_account():
     """Delete the current user's account and all associated data."""
     try:
         db.delete_user_account(g.user['id'])
+        jwt_auth.forget(request.headers.get('Authorization', '')[7:])
         return jsonify({"success": True})
     except Exception as e:
         print(f"Error deleting account: {e}")
@@ -234,9 +260,36 @@ def api_search():
         if suggestion:
             results['suggestion'] = suggestion
 
+    image_urls.add_srcsets(results.get('paintings', []))
     return jsonify(results)
 
 
+@app.route('/api/search/stream')
+def api_search_stream():
+    """Search all museum APIs live, streaming each museum's results as NDJSON."""
+    query = request.args.get('q', '')
+    limit = int(request.args.get('limit', 20))
+    cursor = request.args.get('cursor')
+
+    if not query:
+        return jsonify({"error": "Query parameter 'q' is required"}), 400
+    try:
+        events = api.iter_federated_search(query, limit, cursor=cursor)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    def generate():
+        for event in events:
+            image_urls.add_srcsets(event.get('paintings', []))
+            yield json.dumps(event) + "\n"
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='application/x-ndjson',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
 @app.route('/api/explore/categories')
 def api_get_categories():
     """Get all category data for the explore page."""
@@ -258,6 +311,7 @@ def api_explore_category(category_type, category_key):
     limit = int(request.args.get('limit', 12))
 
     result = categories.fetch_by_category(category_type, category_key, page, limit)
+    image_urls.add_srcsets(result.get('paintings', []))
     return jsonify(result)
 
 
@@ -266,7 +320,7 @@ def api_surprise():
     """Get a random painting for 'Surprise Me' feature."""
     painting = categories.fetch_surprise()
     if painting:
-        return jsonify(painting)
+        return jsonify(image_urls.add_srcset(painting))
     return jsonify({"error": "Could not fetch a painting"}), 500
 
 
@@ -287,7 +341,7 @@ def api_preview():
 
     # Shuffle and limit to 30
     random.shuffle(paintings)
-    return jsonify({"paintings": paintings[:30]})
+    return jsonify({"paintings": image_urls.add_srcsets(paintings[:30])})
 
 
 @app.route('/api/stats')
@@ -297,11 +351,47 @@ def api_stats():
     return jsonify(stats)
 
 
+@app.route('/api/metrics')
+def api_metrics():
+    """Get in-process cache and upstream health metrics for this worker."""
+    metrics = api.get_metrics()
+    metrics["image_proxy"] = image_proxy.stats()
+    metrics["auth"] = jwt_auth.stats()
+    return jsonify(metrics)
+
+
+@app.route('/img')
+def image():
+    """Serve a museum image resized and cached locally."""
+    url = request.args.get('url', '')
+    if not url:
+        return jsonify({"error": "url is required"}), 400
+    if not image_proxy.is_allowed(url):
+        return jsonify({"error": "Image host not allowed"}), 403
+    try:
+        width = int(request.args.get('w', 400))
+    except ValueError:
+        width = 400
+
+    cached = image_proxy.get_image(url, width)
+    if not cached:
+        # Couldn't fetch it ourselves - let the browser try the original
+        return redirect(url)
+
+    path, mimetype = cached
+    try:
+        response = send_file(path, mimetype=mimetype, max_age=31536000)
+    except FileNotFoundError:
+        return redirect(url)  # Evicted between lookup and send
+    response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
+
+
 @app.route('/api/explore/artist/<artist_name>')
 def api_artist_works(artist_name):
     """Fetch works by a specific artist."""
     limit = int(request.args.get('limit', 12))
-    paintings = categories.fetch_artist_works(artist_name, limit)
+    paintings = image_urls.add_srcsets(categories.fetch_artist_works(artist_name, limit))
     return jsonify({"paintings": paintings, "artist": artist_name})
 
 
@@ -348,7 +438,10 @@ def api_painting_of_the_day():
 @app.route('/api/favorites', methods=['GET'])
 @require_auth
 def api_get_favorites():
-    """Get all favorites with optional filters."""
+    """Get a page of favorites with optional filters.
+
+    Pass the returned next_cursor as ?cursor= to get the next page.
+    """
     filters = {}
     if request.args.get('artist'):
         filters['artist'] = request.args.get('artist')
@@ -356,9 +449,17 @@ def api_get_favorites():
         filters['museum'] = request.args.get('museum')
     if request.args.get('tag'):
         filters['tag'] = request.args.get('tag')
+    try:
+        limit = max(1, min(int(request.args.get('limit', 50)), 200))
+    except ValueError:
+        return jsonify({"error": "Invalid limit"}), 400
 
-    favorites = db.get_all_favorites(g.user['id'], filters if filters else None)
-    return jsonify({"favorites": favorites})
+    try:
+        page = db.get_favorites_page(g.user['id'], filters, limit, request.args.get('cursor'))
+    except ValueError:
+        return jsonify({"error": "Invalid cursor"}), 400
+    image_urls.add_srcsets(page['favorites'])
+    return jsonify(page)
 
 
 @app.route('/api/favorites', methods=['POST'])
@@ -479,6 +580,8 @@ def api_delete_journal_entry(entry_id):
 def api_get_collections():
     """Get all collections for the current user."""
     collections = db.get_user_collections(g.user['id'])
+    for collection in collections:
+        collection["cover_srcsets"] = [image_urls.srcset(url) for url in collection.get("cover_images", [])]
     return jsonify({"collections": collections})
 
 
@@ -507,6 +610,7 @@ def api_get_collection(collection_id):
     collection = db.get_collection(collection_id, g.user['id'])
     if not collection:
         return jsonify({"error": "Collection not found"}), 404
+    _fill_collection_items(collection)
     return jsonify(collection)
 
 
@@ -567,9 +671,33 @@ def public_collection(slug):
     collection = db.get_collection_by_slug(slug)
     if not collection:
         return render_template('404.html'), 404
+    _fill_collection_items(collection)
     return render_template('public_collection.html', collection=collection)
 
 
+def _fill_collection_items(collection):
+    """Fill in collection items saved without an image or title, and add srcsets.
+
+    Looks the paintings up with one batch call per museum.
+    """
+    incomplete = {}
+    for item in collection.get("items", []):
+        if not item.get("image_url") or not item.get("title"):
+            incomplete.setdefault(item["museum"], []).append(item)
+
+    for museum, items in incomplete.items():
+        paintings = api.get_paintings_batch(museum, [item["external_id"] for item in items])
+        for item in items:
+            painting = paintings.get(str(item["external_id"]))
+            if painting:
+                item["image_url"] = item.get("image_url") or painting.get("thumbnail_url") or painting.get("image_url")
+                item["title"] = item.get("title") or painting.get("title")
+                item["artist"] = item.get("artist") or painting.get("artist")
+                item["date_display"] = item.get("date_display") or painting.get("date_display")
+
+    image_urls.add_srcsets(collection.get("items", []))
+
+
 def open_browser():
     """Open browser after a short delay."""
     webbrowser.open('http://127.0.0.1:5001')
@@ -0,0 +1,96 @@
+"""
+Shared bounded thread pools for Art Stuff.
+A long-lived pool replaces the per-request ThreadPoolExecutor used for museum
+fan-out, so threads are reused and upstream concurrency stays bounded across
+every request in a worker. Submissions beyond the queue limit, or beyond a
+key's (museum's) concurrency cap, are rejected rather than queued without end.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ExecutorSaturated(Exception):
+    """Raised when a task can't be accepted without exceeding a limit."""
+
+
+class BoundedExecutor:
+    """Thread pool with a queue-depth limit and per-key concurrency caps.
+
+    max_workers threads run tasks; up to max_queue more may wait. A task
+    submitted with a key also counts against that key's cap (key_caps, or
+    default_key_cap) until it finishes or is cancelled.
+    """
+
+    def __init__(self, name, max_workers, max_queue, default_key_cap=None, key_caps=None):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.default_key_cap = default_key_cap
+        self.key_caps = dict(key_caps or {})
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._outstanding = 0  # Queued + running
+        self._running = 0
+        self._by_key = {}
+        self.submitted = 0
+        self.rejected = 0
+        self.peak_outstanding = 0
+
+    def submit(self, key, fn, *args, **kwargs):
+        """Schedule fn(*args, **kwargs), raising ExecutorSaturated if over a limit."""
+        with self._lock:
+            if self._outstanding >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise ExecutorSaturated(f"{self.name} queue is full")
+            cap = self.key_caps.get(key, self.default_key_cap)
+            if key is not None and cap is not None and self._by_key.get(key, 0) >= cap:
+                self.rejected += 1
+                raise ExecutorSaturated(f"{self.name} is at its {key} concurrency cap")
+
+            self._outstanding += 1
+            self.peak_outstanding = max(self.peak_outstanding, self._outstanding)
+            self.submitted += 1
+            if key is not None:
+                self._by_key[key] = self._by_key.get(key, 0) + 1
+
+        try:
+            future = self._executor.submit(self._run, fn, args, kwargs)
+        except Exception:
+            self._release(key)
+            raise
+        future.add_done_callback(lambda _: self._release(key))
+        return future
+
+    def _run(self, fn, args, kwargs):
+        """Run a task, tracking how many are executing."""
+        with self._lock:
+            self._running += 1
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    def _release(self, key):
+        """Free a finished or cancelled task's slot."""
+        with self._lock:
+            self._outstanding -= 1
+            if key is not None:
+                self._by_key[key] -= 1
+                if not self._by_key[key]:
+                    del self._by_key[key]
+
+    def stats(self):
+        """Get pool size, queue depth and rejection counters."""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "running": self._running,
+                "queued": self._outstanding - self._running,
+                "peak_outstanding": self.peak_outstanding,
+                "submitted": self.submitted,
+                "rejected": self.rejected,
+                "saturation": round(self._outstanding / (self.max_workers + self.max_queue), 4),
+                "by_key": dict(self._by_key)
+            }
@@ -5,6 +5,7 @@ Defines eras, themes, moods, and methods to fetch paintings by category.
 import random
 import re
 import supabase_db as db
+import image_urls
 
 
 def extract_year(date_string):
@@ -353,15 +354,7 @@ def resize_image_url(url, width=400):
     """Resize IIIF image URLs to a smaller size for carousel thumbnails.
     This prevents 403 errors from museums blocking large image requests
     and speeds up loading significantly."""
-    if not url:
-        return url
-    # Art Institute of Chicago IIIF pattern: /full/{width},/0/default.jpg
-    if 'artic.edu/iiif' in url:
-        import re
-        return re.sub(r'/full/\d+,/', f'/full/{width},/', url)
-    # Rijksmuseum: already uses reasonable sizes
-    # Cleveland: direct URLs, no resize needed
-    return url
+    return image_urls.sized_url(url, width)
 
 
 def get_representative_paintings():
@@ -380,6 +373,7 @@ def get_representative_paintings():
                 if p.get("image_url"):
                     representatives["eras"][key] = {
                         "image_url": resize_image_url(p["image_url"]),
+                        "srcset": image_urls.srcset(p["image_url"]),
                         "title": p.get("title", ""),
                         "artist": p.get("artist", ""),
                         "museum": p.get("museum", ""),
@@ -399,6 +393,7 @@ def get_representative_paintings():
                 if p.get("image_url"):
                     representatives["themes"][key] = {
                         "image_url": resize_image_url(p["image_url"]),
+                        "srcset": image_urls.srcset(p["image_url"]),
                         "title": p.get("title", ""),
                         "artist": p.get("artist", ""),
                         "museum": p.get("museum", ""),
@@ -417,6 +412,7 @@ def get_representative_paintings():
             if p.get("image_url"):
                 representatives["featured_artist"] = {
                     "image_url": resize_image_url(p["image_url"]),
+                    "srcset": image_urls.srcset(p["image_url"]),
                     "title": p.get("title", ""),
                     "artist": p.get("artist", ""),
                     "museum": p.get("museum", ""),
@@ -0,0 +1,93 @@
+"""
+Circuit breakers for museum API calls.
+A breaker trips open after repeated failures or timeouts so federated search
+skips a struggling museum instead of waiting on it, then lets a single probe
+request through after a cool-down to see whether it has recovered. A probe
+that never reports back is given up on after CIRCUIT_PROBE_TIMEOUT_SECONDS.
+"""
+import os
+import threading
+import time
+
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "3"))
+CIRCUIT_RESET_SECONDS = int(os.getenv("CIRCUIT_RESET_SECONDS", "60"))
+CIRCUIT_PROBE_TIMEOUT_SECONDS = int(os.getenv("CIRCUIT_PROBE_TIMEOUT_SECONDS", "30"))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Thread-safe closed/open/half-open circuit breaker."""
+
+    def __init__(self, name, failure_threshold=CIRCUIT_FAILURE_THRESHOLD,
+                 reset_seconds=CIRCUIT_RESET_SECONDS, probe_timeout=CIRCUIT_PROBE_TIMEOUT_SECONDS):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.probe_timeout = probe_timeout
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.trips = 0
+        self.rejected = 0
+        self._probe_in_flight = False
+        self._probe_started_at = None
+        self._lock = threading.Lock()
+
+    def allow_request(self):
+        """Return True if a call may go ahead, False if it should be skipped."""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_seconds:
+                self.state = HALF_OPEN
+                self._probe_in_flight = False
+
+            # Half-open lets exactly one probe through at a time; a probe
+            # that never reported back doesn't hold the slot forever
+            if self.state == HALF_OPEN and (
+                    not self._probe_in_flight
+                    or time.monotonic() - self._probe_started_at >= self.probe_timeout):
+                self._probe_in_flight = True
+                self._probe_started_at = time.monotonic()
+                return True
+
+            self.rejected += 1
+            return False
+
+    def release_probe(self):
+        """Give back a half-open probe slot for a call that never ran."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_success(self):
+        """Close the circuit after a successful call."""
+        with self._lock:
+            self.state = CLOSED
+            self.consecutive_failures = 0
+            self.opened_at = None
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        """Count a failure or timeout, tripping the circuit at the threshold."""
+        with self._lock:
+            self.consecutive_failures += 1
+            self._probe_in_flight = False
+            if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.trips += 1
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+
+    def stats(self):
+        """Get the breaker's current state and counters."""
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "trips": self.trips,
+                "rejected": self.rejected
+            }
@@ -337,8 +337,34 @@ def get_cached_response(cache_key):
         return None
 
 
-def set_cached_response(cache_key, response_data):
-    """Cache an API response."""
+def get_cached_entry(cache_key):
+    """Get a cached API response as {"response_data", "expires_at"}.
+
+    Local cache entries don't expire, so expires_at is always None and
+    no validators are kept.
+    """
+    response_data = get_cached_response(cache_key)
+    if response_data is None:
+        return None
+    return {"response_data": response_data, "expires_at": None, "etag": None, "last_modified": None}
+
+
+def get_cached_entries(cache_keys):
+    """Get many cached API responses, as {cache_key: entry} (see get_cached_entry)."""
+    entries = {}
+    for cache_key in cache_keys:
+        entry = get_cached_entry(cache_key)
+        if entry:
+            entries[cache_key] = entry
+    return entries
+
+
+def extend_cached_response(cache_key, ttl_hours=None):
+    """No-op: local cache entries don't expire."""
+
+
+def set_cached_response(cache_key, response_data, ttl_hours=None, etag=None, last_modified=None):
+    """Cache an API response (ttl_hours and validators are ignored; local entries don't expire)."""
     with get_db() as conn:
         cursor = conn.cursor()
         cursor.execute("""
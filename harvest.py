@@ -6,13 +6,19 @@ Usage:
     python harvest.py              # Run harvest for all museums
     python harvest.py aic          # Run harvest for specific museum
     python harvest.py --artists    # Harvest popular artists
+    python harvest.py --met-descriptions  # Backfill scraped Met descriptions
+    python harvest.py --refresh aic       # Re-fetch stored paintings for a museum
+    python harvest.py --purge-cache       # Delete dead API cache entries
 """
 import sys
 import time
 from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from supabase_db import get_client, upsert_painting
+from supabase_db import (
+    get_client, upsert_painting, get_paintings_missing_web_description, get_painting_external_ids,
+    clear_old_cache
+)
 import museum_apis as api
 
 
@@ -113,8 +119,8 @@ def harvest_rijks(terms=None):
     print("\n--- Rijksmuseum ---")
 
     # Rijksmuseum uses OAI-PMH which loads all paintings at once
-    # Just search with empty query to trigger cache load
-    paintings = api._load_rijks_paintings()
+    # (a cold load parses pages in a process pool here, outside the web app)
+    paintings = api._load_rijks_paintings(workers=api.RIJKS_PARSE_WORKERS)
     total = 0
 
     for painting in paintings:
@@ -146,6 +152,54 @@ def harvest_met(terms=None):
     return total
 
 
+def harvest_met_descriptions(batch_size=50):
+    """Backfill Met website descriptions for harvested paintings."""
+    print("\n--- Met descriptions ---")
+    total = 0
+    attempted = set()
+
+    while True:
+        # Over-fetch by the number of failed rows so they don't block progress
+        rows = get_paintings_missing_web_description("met", batch_size + len(attempted))
+        rows = [r for r in rows if r["external_id"] not in attempted]
+        if not rows:
+            break
+
+        for row in rows:
+            attempted.add(row["external_id"])
+            if api.enrich_met_description(row) is not None:
+                total += 1
+            time.sleep(0.5)  # Met website rate limiting
+
+        print(f"    Enriched {total} paintings...")
+
+    print(f"  Total: {total} paintings")
+    return total
+
+
+def refresh_museum(museum, batch_size=100):
+    """Re-fetch every stored painting from a museum and update its row."""
+    print(f"\n--- Refreshing {museum} ---")
+    external_ids = get_painting_external_ids(museum)
+    total = 0
+
+    for start in range(0, len(external_ids), batch_size):
+        batch = external_ids[start:start + batch_size]
+        # Skip the paintings table (it's what we're refreshing) and the
+        # API cache, so every painting comes from the museum
+        paintings = api.get_paintings_batch(museum, batch, use_db=False, use_cache=False)
+        for painting in paintings.values():
+            if painting.get("image_url") and painting.get("title"):
+                if upsert_painting(painting):
+                    total += 1
+        print(f"    Refreshed {total} of {min(start + batch_size, len(external_ids))} paintings...")
+        time.sleep(0.5)  # Respect rate limits
+
+    log_harvest(museum, "refreshed", total)
+    print(f"  Total: {total} paintings")
+    return total
+
+
 def harvest_cleveland(terms=None):
     """Harvest Cleveland Museum of Art paintings."""
     print("\n--- Cleveland Museum of Art ---")
@@ -246,6 +300,14 @@ def harvest_smk(terms=None):
     return total
 
 
+def purge_cache():
+    """Delete API cache entries past their stale-while-revalidate window."""
+    print("\n--- API cache ---")
+    deleted = clear_old_cache()
+    print(f"  Deleted {deleted} dead cache entries")
+    return deleted
+
+
 def harvest_all():
     """Run harvest for all configured museums."""
     print("=" * 50)
@@ -263,6 +325,7 @@ def harvest_all():
         "smithsonian": harvest_smithsonian(),
         "smk": harvest_smk(),
     }
+    purge_cache()
 
     print("\n" + "=" * 50)
     print("HARVEST COMPLETE")
@@ -315,6 +378,15 @@ if __name__ == "__main__":
             harvest_cleveland(artist_terms)
             harvest_met(artist_terms[:15])
 
+        elif arg == "--met-descriptions":
+            harvest_met_descriptions()
+
+        elif arg == "--purge-cache":
+            purge_cache()
+
+        elif arg == "--refresh" and len(sys.argv) > 2:
+            refresh_museum(sys.argv[2].lower())
+
         elif arg == "aic":
             harvest_aic()
         elif arg == "rijks":
@@ -333,7 +405,7 @@ if __name__ == "__main__":
             harvest_smk()
         else:
             print(f"Unknown argument: {arg}")
-            print("Usage: python harvest.py [museum|--stats|--artists]")
+            print("Usage: python harvest.py [museum|--stats|--artists|--met-descriptions|--refresh museum|--purge-cache]")
             print("Museums: aic, rijks, met, cleveland, harvard, europeana, smithsonian, smk")
     else:
         harvest_all()
@@ -0,0 +1,230 @@
+"""
+Local image proxy for Art Stuff.
+Fetches museum images once, resizes them to a fixed set of widths and keeps
+the results in a size-bounded disk cache (least recently used files are
+evicted first), so pages load small images from us instead of full-size ones
+from museum CDNs that are slow or block hotlinking.
+
+Resizing needs Pillow, which is in requirements.txt. The fallback without it
+(images cached and served at their original size) is only meant for local
+development.
+"""
+import io
+import os
+import hashlib
+import threading
+from urllib.parse import urlparse, urlencode, urljoin
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from response_cache import SingleFlight
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+IMAGE_CACHE_DIR = os.getenv("IMAGE_CACHE_DIR", "image_cache")
+IMAGE_CACHE_MAX_MB = int(os.getenv("IMAGE_CACHE_MAX_MB", "500"))
+IMAGE_WIDTHS = (200, 400, 800, 1200)
+IMAGE_QUALITY = 82
+IMAGE_FETCH_TIMEOUT = 15
+IMAGE_MAX_SOURCE_BYTES = 40 * 1024 * 1024
+IMAGE_MAX_REDIRECTS = 5
+
+# Hosts we proxy for (suffix match) - anything else is refused, so the
+# route can't be used to fetch arbitrary URLs
+IMAGE_PROXY_HOSTS = tuple(
+    host.strip() for host in os.getenv(
+        "IMAGE_PROXY_HOSTS",
+        "artic.edu,metmuseum.org,clevelandart.org,harvardartmuseums.org,harvard.edu,"
+        "rijksmuseum.nl,micr.io,smk.dk,whitney.org,si.edu,europeana.eu"
+    ).split(",") if host.strip()
+)
+
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_maxsize=16))
+_session.mount("http://", HTTPAdapter(pool_maxsize=16))
+
+_downloads = SingleFlight()
+_cache_lock = threading.Lock()
+_cache_bytes = None  # Total size of the cache directory, scanned on first use
+
+
+def is_allowed(url):
+    """Check that a URL is an http(s) image on a museum host we proxy."""
+    parsed = urlparse(url or "")
+    host = (parsed.hostname or "").lower()
+    return parsed.scheme in ("http", "https") and any(
+        host == allowed or host.endswith("." + allowed) for allowed in IMAGE_PROXY_HOSTS
+    )
+
+
+def snap_width(width):
+    """Round a requested width up to the nearest cached size."""
+    for size in IMAGE_WIDTHS:
+        if width <= size:
+            return size
+    return IMAGE_WIDTHS[-1]
+
+
+def proxied_url(url, width=400):
+    """Get the proxy URL for an image, or the URL unchanged if we don't proxy it."""
+    if not is_allowed(url):
+        return url
+    return "/img?" + urlencode({"url": url, "w": snap_width(width)})
+
+
+def get_image(url, width):
+    """Get the cached file for an image at a width, fetching it if needed.
+
+    Returns (path, mimetype), or None if the image couldn't be fetched.
+    """
+    width = snap_width(width) if Image is not None else 0  # 0 = original size
+    name = hashlib.sha256(f"{url}|{width}".encode("utf-8")).hexdigest()
+    path = os.path.join(IMAGE_CACHE_DIR, name[:2], name)
+
+    if not os.path.exists(path):
+        # Concurrent requests for one image share a single download
+        if not _downloads.do(path, lambda: _fetch_to_cache(url, width, path)):
+            return None
+
+    try:
+        os.utime(path)  # Mark as recently used for eviction
+    except OSError:
+        return None
+    return path, _sniff_mimetype(path)
+
+
+def _fetch_to_cache(url, width, path):
+    """Download, resize and store one image. Returns True on success."""
+    if os.path.exists(path):
+        return True
+
+    try:
+        content = _download(url)
+    except requests.RequestException as e:
+        print(f"Image fetch failed: {e}")
+        return False
+    if content is None:
+        return False
+
+    if width and Image is not None:
+        try:
+            content = _resize(content, width)
+        except Exception as e:
+            print(f"Image resize failed for {url}: {e}")
+            return False
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+    _record_write(len(content))
+    return True
+
+
+def _download(url):
+    """Fetch an image's bytes, or None if it is refused.
+
+    Redirects are followed by hand so every hop is checked against the host
+    allowlist - otherwise an open redirect on an allowed host could point
+    the proxy at internal addresses.
+    """
+    for _ in range(IMAGE_MAX_REDIRECTS + 1):
+        with _session.get(url, timeout=IMAGE_FETCH_TIMEOUT, stream=True, allow_redirects=False) as response:
+            if response.is_redirect:
+                url = urljoin(url, response.headers.get("Location", ""))
+                if not is_allowed(url):
+                    print(f"Image redirect to disallowed host refused: {url}")
+                    return None
+                continue
+            response.raise_for_status()
+            content = response.raw.read(IMAGE_MAX_SOURCE_BYTES + 1, decode_content=True)
+        if len(content) > IMAGE_MAX_SOURCE_BYTES:
+            print(f"Image too large to proxy: {url}")
+            return None
+        return content
+
+    print(f"Too many image redirects: {url}")
+    return None
+
+
+def _resize(content, width):
+    """Scale an image down to width (never up) and encode it as JPEG."""
+    with Image.open(io.BytesIO(content)) as image:
+        image.draft("RGB", (width, width * 4))  # Fast JPEG downscale on decode
+        if image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        if image.width > width:
+            image = image.resize((width, max(1, round(image.height * width / image.width))), Image.LANCZOS)
+        out = io.BytesIO()
+        image.save(out, "JPEG", quality=IMAGE_QUALITY, optimize=True, progressive=True)
+        return out.getvalue()
+
+
+def _sniff_mimetype(path):
+    """Guess an image's type from its first bytes."""
+    with open(path, "rb") as f:
+        head = f.read(12)
+    if head.startswith(b"\x89PNG"):
+        return "image/png"
+    if head.startswith(b"GIF8"):
+        return "image/gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return "image/jpeg"
+
+
+def _record_write(size):
+    """Add a new file to the cache size, evicting old files if over budget."""
+    global _cache_bytes
+    with _cache_lock:
+        if _cache_bytes is None:
+            _cache_bytes = sum(size for _, size, _ in _cache_files())
+        else:
+            _cache_bytes += size
+
+        max_bytes = IMAGE_CACHE_MAX_MB * 1024 * 1024
+        if _cache_bytes <= max_bytes:
+            return
+
+        # Evict least recently used files down to 90% of the budget
+        for path, size, _ in sorted(_cache_files(), key=lambda f: f[2]):
+            if _cache_bytes <= max_bytes * 0.9:
+                break
+            try:
+                os.remove(path)
+                _cache_bytes -= size
+            except OSError:
+                pass
+
+
+def _cache_files():
+    """List (path, size, last_used) for every cached image."""
+    files = []
+    for root, _, names in os.walk(IMAGE_CACHE_DIR):
+        for name in names:
+            if name.endswith(".tmp"):
+                continue
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files.append((path, stat.st_size, stat.st_mtime))
+    return files
+
+
+def stats():
+    """Get the cache size and whether images are being resized."""
+    with _cache_lock:
+        return {
+            "bytes": _cache_bytes,
+            "max_bytes": IMAGE_CACHE_MAX_MB * 1024 * 1024,
+            "resizing": Image is not None,
+            "downloads": _downloads.stats()
+        }
@@ -0,0 +1,68 @@
+"""
+Responsive image URLs for Art Stuff.
+Turns a painting's image URL into URLs for a small ladder of widths, using the
+museum's own IIIF resizing where it has it (AIC, Rijksmuseum, SMK, Harvard),
+a width parameter for image services that take one, and the local image proxy
+otherwise, so pages can offer a srcset and browsers download only the pixels
+they show.
+"""
+import re
+from urllib.parse import urlparse, parse_qsl, urlencode
+
+import image_proxy
+
+SRCSET_WIDTHS = (200, 400, 800)
+
+# IIIF Image API paths: {base}/{region}/{size}/{rotation}/{quality}.{format}
+_IIIF_RE = re.compile(
+    r"^(?P<base>https?://.+)/(?P<region>full|square)/(?P<size>[^/]+)/"
+    r"(?P<rotation>!?\d+)/(?P<image>(?:default|color|gray|native)\.(?:jpg|png|webp))$"
+)
+
+# Image services that resize with a query parameter instead of IIIF paths
+_WIDTH_PARAMS = {
+    "nrs.harvard.edu": "width",  # Harvard's redirect to its IIIF server
+    "ids.si.edu": "max_w"
+}
+
+
+def sized_url(url, width):
+    """Get a URL for an image scaled to width, or the URL unchanged if it can't be."""
+    if not url:
+        return url
+
+    match = _IIIF_RE.match(url)
+    if match:
+        return f"{match['base']}/{match['region']}/{width},/{match['rotation']}/{match['image']}"
+
+    parsed = urlparse(url)
+    param = _WIDTH_PARAMS.get((parsed.hostname or "").lower())
+    if param:
+        query = [(k, v) for k, v in parse_qsl(parsed.query) if k not in ("width", "max_w")]
+        query.append((param, str(width)))
+        return parsed._replace(query=urlencode(query)).geturl()
+
+    return image_proxy.proxied_url(url, width)
+
+
+def srcset(url, widths=SRCSET_WIDTHS):
+    """Build a srcset attribute value for an image, or "" if it can't be resized."""
+    if not url:
+        return ""
+    candidates = [(sized_url(url, width), width) for width in widths]
+    if len({candidate for candidate, _ in candidates}) == 1:
+        return ""  # Same URL at every width - nothing to choose between
+    return ", ".join(f"{candidate} {width}w" for candidate, width in candidates)
+
+
+def add_srcset(painting):
+    """Add a srcset for a painting (or collection item) dict in place."""
+    painting["srcset"] = srcset(painting.get("image_url") or painting.get("thumbnail_url"))
+    return painting
+
+
+def add_srcsets(paintings):
+    """Add srcsets to a list of paintings in place."""
+    for painting in paintings:
+        add_srcset(painting)
+    return paintings
@@ -0,0 +1,242 @@
+"""
+Access token verification for Art Stuff.
+Checks Supabase access tokens (JWTs) locally instead of asking Supabase Auth
+on every request: HS256 tokens against the project's JWT secret, and
+asymmetric (ES256/RS256) tokens against the project's published JWKS. Verified
+users are cached for a short TTL, never past the token's own expiry, so
+revocation is bounded by that TTL and the token lifetime.
+
+Asymmetric keys need PyJWT with cryptography (pip install "pyjwt[crypto]").
+Tokens that can't be checked locally (no secret set, no PyJWT) fall back to
+the network lookup.
+"""
+import os
+import json
+import hmac
+import time
+import base64
+import binascii
+import hashlib
+import threading
+
+import requests
+from dotenv import load_dotenv
+
+from response_cache import TTLCache
+
+try:
+    import jwt
+except ImportError:
+    jwt = None
+
+load_dotenv()
+
+SUPABASE_URL = os.getenv("SUPABASE_URL", "")
+SUPABASE_JWT_SECRET = os.getenv("SUPABASE_JWT_SECRET", "")
+SUPABASE_JWT_AUDIENCE = os.getenv("SUPABASE_JWT_AUDIENCE", "authenticated")
+AUTH_CACHE_SECONDS = int(os.getenv("AUTH_CACHE_SECONDS", "60"))
+AUTH_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "10000"))
+AUTH_JWKS_REFRESH_SECONDS = int(os.getenv("AUTH_JWKS_REFRESH_SECONDS", "600"))
+AUTH_CLOCK_LEEWAY_SECONDS = 10
+_JWKS_MIN_REFETCH_SECONDS = 30  # Unknown key ids don't trigger a fetch more often than this
+
+_ASYMMETRIC_ALGORITHMS = ("ES256", "RS256")
+
+_users = TTLCache(max_entries=AUTH_CACHE_MAX_ENTRIES, ttl_seconds=AUTH_CACHE_SECONDS)
+
+_jwks_lock = threading.Lock()
+_jwks_keys = {}  # kid -> verification key
+_jwks_fetched_at = 0.0
+
+_stats_lock = threading.Lock()
+_stats = {"verified_locally": 0, "rejected": 0, "fallbacks": 0}
+
+
+class InvalidToken(Exception):
+    """Raised when a token is malformed, forged, expired or for someone else."""
+
+
+def get_user(access_token, fallback=None):
+    """Get {"id", "email"} for a valid access token, or None.
+
+    fallback(access_token) is called for tokens that can't be verified
+    locally (e.g. supabase_db.get_user_from_token); its result is cached
+    the same way.
+    """
+    if not access_token:
+        return None
+    key = _cache_key(access_token)
+    user = _users.get(key)
+    if user is not None:
+        return dict(user)
+
+    try:
+        claims = decode_token(access_token)
+    except InvalidToken as e:
+        _count("rejected")
+        print(f"Rejected access token: {e}")
+        return None
+
+    if claims is not None:
+        _count("verified_locally")
+        user = {"id": claims["sub"], "email": claims.get("email")}
+        expires_at = claims["exp"]
+    else:
+        if fallback is None:
+            return None
+        _count("fallbacks")
+        user = fallback(access_token)
+        if not user:
+            return None
+        expires_at = _unverified_expiry(access_token)
+
+    ttl = AUTH_CACHE_SECONDS
+    if expires_at is not None:
+        ttl = min(ttl, expires_at - time.time())
+    if ttl > 0:
+        _users.set(key, user, ttl_seconds=ttl)
+    return dict(user)
+
+
+def forget(access_token):
+    """Drop a token from the cache (e.g. on sign out)."""
+    if access_token:
+        _users.delete(_cache_key(access_token))
+
+
+def decode_token(access_token):
+    """Verify a token's signature and claims locally.
+
+    Returns the claims, or None if there's no key to check this kind of
+    token with. Raises InvalidToken if the token is not valid.
+    """
+    try:
+        header_segment, payload_segment, signature_segment = access_token.split(".")
+        header = json.loads(_b64decode(header_segment))
+        claims = json.loads(_b64decode(payload_segment))
+        signature = _b64decode(signature_segment)
+    except (ValueError, binascii.Error) as e:
+        raise InvalidToken("malformed token") from e
+    if not isinstance(header, dict) or not isinstance(claims, dict):
+        raise InvalidToken("malformed token")
+
+    algorithm = header.get("alg")
+    if algorithm == "HS256":
+        if not SUPABASE_JWT_SECRET:
+            return None
+        signing_input = f"{header_segment}.{payload_segment}".encode("ascii")
+        expected = hmac.new(SUPABASE_JWT_SECRET.encode("utf-8"), signing_input, hashlib.sha256).digest()
+        if not hmac.compare_digest(expected, signature):
+            raise InvalidToken("bad signature")
+    elif algorithm in _ASYMMETRIC_ALGORITHMS:
+        if jwt is None:
+            return None
+        key = _signing_key(header.get("kid"))
+        if key is None:
+            return None
+        try:
+            # Signature only - the claims are checked below for every algorithm
+            jwt.decode(access_token, key, algorithms=[algorithm],
+                       options={"verify_exp": False, "verify_nbf": False, "verify_iat": False,
+                                "verify_aud": False, "verify_iss": False})
+        except jwt.InvalidTokenError as e:
+            raise InvalidToken(f"bad signature ({e})") from e
+    else:
+        raise InvalidToken(f"unsupported algorithm {algorithm!r}")
+
+    _check_claims(claims)
+    return claims
+
+
+def _check_claims(claims):
+    """Check expiry, audience, issuer and subject."""
+    now = time.time()
+    expires_at = claims.get("exp")
+    if not isinstance(expires_at, (int, float)) or expires_at + AUTH_CLOCK_LEEWAY_SECONDS <= now:
+        raise InvalidToken("expired")
+    not_before = claims.get("nbf")
+    if isinstance(not_before, (int, float)) and not_before - AUTH_CLOCK_LEEWAY_SECONDS > now:
+        raise InvalidToken("not yet valid")
+
+    audience = claims.get("aud")
+    audiences = audience if isinstance(audience, list) else [audience]
+    if SUPABASE_JWT_AUDIENCE and SUPABASE_JWT_AUDIENCE not in audiences:
+        raise InvalidToken("wrong audience")
+
+    issuer = claims.get("iss")
+    if issuer and SUPABASE_URL and issuer != f"{SUPABASE_URL.rstrip('/')}/auth/v1":
+        raise InvalidToken("wrong issuer")
+
+    if not claims.get("sub"):
+        raise InvalidToken("no subject")
+
+
+def _signing_key(kid):
+    """Get the JWKS key for a key id, fetching the key set when needed."""
+    global _jwks_fetched_at
+    with _jwks_lock:
+        age = time.monotonic() - _jwks_fetched_at
+        stale = age > AUTH_JWKS_REFRESH_SECONDS
+        unknown = kid not in _jwks_keys and age > _JWKS_MIN_REFETCH_SECONDS
+        if (stale or unknown) and SUPABASE_URL:
+            _jwks_fetched_at = time.monotonic()
+            keys = _fetch_jwks()
+            if keys is not None:
+                _jwks_keys.clear()
+                _jwks_keys.update(keys)
+        return _jwks_keys.get(kid)
+
+
+def _fetch_jwks():
+    """Fetch the project's public signing keys, or None on failure."""
+    url = f"{SUPABASE_URL.rstrip('/')}/auth/v1/.well-known/jwks.json"
+    try:
+        response = requests.get(url, timeout=5)
+        response.raise_for_status()
+        keys = {}
+        for jwk in response.json().get("keys", []):
+            try:
+                keys[jwk.get("kid")] = jwt.PyJWK(jwk).key
+            except jwt.PyJWTError as e:
+                print(f"Skipping JWKS key {jwk.get('kid')}: {e}")
+        return keys
+    except (requests.RequestException, ValueError) as e:
+        print(f"JWKS fetch failed: {e}")
+        return None
+
+
+def _unverified_expiry(access_token):
+    """Read a token's exp without verifying it (only to bound a cache TTL)."""
+    try:
+        expires_at = json.loads(_b64decode(access_token.split(".")[1])).get("exp")
+    except (ValueError, IndexError, AttributeError, binascii.Error):
+        return None
+    return expires_at if isinstance(expires_at, (int, float)) else None
+
+
+def _b64decode(segment):
+    """Decode unpadded base64url."""
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def _cache_key(access_token):
+    """Hash tokens so raw credentials aren't kept as cache keys."""
+    return hashlib.sha256(access_token.encode("utf-8")).hexdigest()
+
+
+def _count(name):
+    """Increment a verification counter."""
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def stats():
+    """Get verification counters and cache stats."""
+    with _stats_lock:
+        counters = dict(_stats)
+    return {
+        **counters,
+        "local_hs256": bool(SUPABASE_JWT_SECRET),
+        "local_jwks": jwt is not None and bool(SUPABASE_URL),
+        "cache": _users.stats()
+    }
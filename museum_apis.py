@@ -3,22 +3,56 @@ Museum API integrations for Art Stuff.
 Supports Art Institute of Chicago, Cleveland Museum of Art, Harvard Art Museums,
 Metropolitan Museum of Art, Rijksmuseum, and SMK (Denmark).
 """
+import io
+import multiprocessing
 import os
 import re
+import copy
+import gzip
+import json
+import base64
 import requests
+import math
 import hashlib
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import queue
+import threading
+import time
+from urllib.parse import urlparse
+from contextlib import contextmanager
+from xml.sax.saxutils import unescape
+from datetime import datetime, timezone
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 
+try:
+    import fcntl
+except ImportError:  # Windows - no cross-process snapshot lock
+    fcntl = None
+
+from response_cache import (
+    memory_cache, negative_cache, inflight, cache_policy,
+    NEGATIVE_CACHE_NOT_FOUND_SECONDS
+)
+from circuit_breaker import CircuitBreaker
+from bounded_executor import BoundedExecutor, ExecutorSaturated
+from search_index import TextIndex, FuzzyIndex, tokenize
+from result_merge import merge_ranked, encode_cursor, decode_cursor, UNKNOWN_ARTISTS
+
 # Use Supabase for cloud caching and local DB queries
 try:
     from supabase_db import (
-        get_cached_response, set_cached_response,
-        search_paintings, get_painting_from_db
+        get_cached_entry, set_cached_response, extend_cached_response,
+        get_cached_entries, search_paintings, get_painting_from_db,
+        get_paintings_from_db, get_painting_names,
+        save_web_description, clear_old_cache
     )
     USE_LOCAL_DB = True
 except ImportError:
-    from database import get_cached_response, set_cached_response
+    from database import (
+        get_cached_entry, get_cached_entries, set_cached_response, extend_cached_response
+    )
     USE_LOCAL_DB = False
 
 # Load environment variables from .env file
@@ -58,8 +92,93 @@ WHITNEY_BASE_URL = "https://whitney.org/api"
 
 REQUEST_TIMEOUT = 15
 
-# Cache for Rijksmuseum paintings (loaded on first search)
+# HTTP connection pooling - one keep-alive session per museum host
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "16"))  # Max open connections per host
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "2"))  # Connect errors and HTTP_RETRY_STATUSES
+# Read timeouts aren't retried by default - a slow museum would hold a request
+# for (retries + 1) * REQUEST_TIMEOUT
+HTTP_READ_RETRIES = int(os.getenv("HTTP_READ_RETRIES", "0"))
+HTTP_BACKOFF_FACTOR = float(os.getenv("HTTP_BACKOFF_FACTOR", "0.5"))
+HTTP_RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Longest Retry-After we'll sleep for before retrying - a museum asking for
+# longer would hold the worker past REQUEST_TIMEOUT and the search deadline
+HTTP_MAX_RETRY_AFTER_SECONDS = float(os.getenv("HTTP_MAX_RETRY_AFTER_SECONDS", "5"))
+
+_http_sessions = {}
+_http_sessions_lock = threading.Lock()
+
+
+class _CappedRetry(Retry):
+    """Retry that honours Retry-After only up to HTTP_MAX_RETRY_AFTER_SECONDS."""
+
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, HTTP_MAX_RETRY_AFTER_SECONDS)
+
+# Max concurrent single-object fetches for batch lookups on museums without a
+# multi-ID endpoint, e.g. Met search results (shared across the process)
+MET_FETCH_CONCURRENCY = int(os.getenv("MET_FETCH_CONCURRENCY", "8"))
+
+# Max IDs per upstream request for museums with multi-ID lookups (AIC, Harvard)
+BATCH_FETCH_SIZE = 100
+
+# Background queue for scraping Met website descriptions
+MET_ENRICHMENT_QUEUE_SIZE = int(os.getenv("MET_ENRICHMENT_QUEUE_SIZE", "500"))
+
+# Federated search latency budget - museums still running at the deadline are skipped
+SEARCH_DEADLINE_SECONDS = float(os.getenv("SEARCH_DEADLINE_SECONDS", "6"))
+# Send a duplicate request to museums that haven't answered after this long (0 = off)
+SEARCH_HEDGE_AFTER_SECONDS = float(os.getenv("SEARCH_HEDGE_AFTER_SECONDS", "0"))
+
+# Federated search reads each museum's results in fixed-size upstream pages,
+# so the responses are cached and reused as the user pages deeper
+FEDERATED_PAGE_SIZE = int(os.getenv("FEDERATED_PAGE_SIZE", "10"))
+FEDERATED_MAX_PAGES_PER_WINDOW = 3
+# Furthest upstream page a cursor may point at (AIC stops at 10,000 results)
+FEDERATED_MAX_CURSOR_PAGE = 1000
+
+# Shared federated search pool - threads, extra queued searches, and the max
+# outstanding searches per museum (SEARCH_MUSEUM_CAPS overrides, e.g. "met=4,smk=2")
+SEARCH_EXECUTOR_WORKERS = int(os.getenv("SEARCH_EXECUTOR_WORKERS", "32"))
+SEARCH_EXECUTOR_QUEUE = int(os.getenv("SEARCH_EXECUTOR_QUEUE", "64"))
+SEARCH_MUSEUM_CONCURRENCY = int(os.getenv("SEARCH_MUSEUM_CONCURRENCY", "8"))
+SEARCH_MUSEUM_CAPS = {
+    name.strip(): int(cap)
+    for name, _, cap in (item.partition("=") for item in os.getenv("SEARCH_MUSEUM_CAPS", "").split(","))
+    if cap.strip()
+}
+
+# Cached responses are stored already formatted into painting dicts. Bump the
+# version whenever a _format_* function changes so old entries are ignored.
+CACHE_FORMAT_VERSION = 1
+# Gzip cached responses in api_cache (smaller rows and transfers, more CPU)
+CACHE_COMPRESS = os.getenv("CACHE_COMPRESS", "false").lower() == "true"
+
+# Background refresh of stale cache entries (stale-while-revalidate)
+CACHE_REVALIDATE_QUEUE_SIZE = int(os.getenv("CACHE_REVALIDATE_QUEUE_SIZE", "200"))
+# How often the revalidation worker deletes api_cache rows past the stale window
+CACHE_PURGE_HOURS = float(os.getenv("CACHE_PURGE_HOURS", "24"))
+
+# Per-thread record of upstream failures (read by federated search) and 404s
+# (read by get_painting)
+_request_state = threading.local()
+
+# Rijksmuseum catalogue snapshot - parsed OAI-PMH records saved as gzipped JSON
+RIJKS_SNAPSHOT_PATH = os.getenv("RIJKS_SNAPSHOT_PATH", "rijks_paintings.json.gz")
+RIJKS_REFRESH_HOURS = float(os.getenv("RIJKS_REFRESH_HOURS", "24"))
+# Minimum wait before retrying after a harvest that never completed (upstream outage)
+RIJKS_RETRY_MINUTES = float(os.getenv("RIJKS_RETRY_MINUTES", "30"))
+RIJKS_MAX_PAGES = 50  # Pages fetched by a full (non-incremental) load
+# Worker processes parsing OAI-PMH pages during a full load from the harvest
+# CLI (0 = parse in-thread). The web app always parses in-thread.
+RIJKS_PARSE_WORKERS = int(os.getenv("RIJKS_PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+# Cache for Rijksmuseum paintings (loaded from snapshot or OAI-PMH)
 _rijks_paintings_cache = None
+_rijks_index = None  # TextIndex over title/artist/description
+_rijks_by_id = {}    # external_id -> painting
 
 # Common artist names for spell-check suggestions
 KNOWN_ARTISTS = [
@@ -106,64 +225,98 @@ KNOWN_ARTISTS = [
 ]
 
 
-def _levenshtein_distance(s1, s2):
-    """Calculate the Levenshtein distance between two strings."""
-    s1, s2 = s1.lower(), s2.lower()
-    if len(s1) < len(s2):
-        s1, s2 = s2, s1
+# Spelling suggestions: max edits from a known name, and how often to rebuild
+# the index from the paintings table
+SPELLING_MAX_DISTANCE = 2
+SPELLING_REFRESH_HOURS = float(os.getenv("SPELLING_REFRESH_HOURS", "24"))
 
-    if len(s2) == 0:
-        return len(s1)
 
-    prev_row = range(len(s2) + 1)
-    for i, c1 in enumerate(s1):
-        curr_row = [i + 1]
-        for j, c2 in enumerate(s2):
-            insertions = prev_row[j + 1] + 1
-            deletions = curr_row[j] + 1
-            substitutions = prev_row[j] + (c1 != c2)
-            curr_row.append(min(insertions, deletions, substitutions))
-        prev_row = curr_row
+def _build_spelling_index(painting_names=()):
+    """Build the spelling index from KNOWN_ARTISTS plus painting artists and titles."""
+    index = FuzzyIndex(max_distance=SPELLING_MAX_DISTANCE)
 
-    return prev_row[-1]
+    # Known artists first so their display names win for shared words
+    for artist in KNOWN_ARTISTS:
+        index.add(artist, artist)
+        for word in artist.lower().split():
+            if len(word) >= 3:
+                index.add(word, artist)
+
+    for row in painting_names:
+        artist = (row.get("artist") or "").strip()
+        if artist and artist.lower() not in UNKNOWN_ARTISTS:
+            index.add(artist, artist)
+            for word in artist.lower().split():
+                if len(word) >= 3:
+                    index.add(word, artist)
+        for token in tokenize(row.get("title") or ""):
+            if len(token) >= 3 and token.isalpha():
+                index.add(token, token)
+
+    return index
+
+
+_spelling_index = _build_spelling_index()
+_spelling_built_at = None  # Epoch seconds of the last build including the paintings table
+_spelling_lock = threading.Lock()
+_spelling_building = False
+
+
+def warm_spelling_index():
+    """Rebuild the spelling index with painting names in the background."""
+    global _spelling_building
+    if not USE_LOCAL_DB:
+        return
+    with _spelling_lock:
+        if _spelling_building:
+            return
+        _spelling_building = True
+    threading.Thread(target=_refresh_spelling_index, name="spelling-index", daemon=True).start()
+
+
+def _refresh_spelling_index():
+    """Build the full spelling index and swap it in."""
+    global _spelling_index, _spelling_built_at, _spelling_building
+    try:
+        index = _build_spelling_index(get_painting_names())
+        _spelling_index = index
+        _spelling_built_at = time.time()
+        print(f"Built spelling index with {len(index)} terms")
+    except Exception as e:
+        print(f"Error building spelling index: {e}")
+    finally:
+        _spelling_building = False
 
 
-def suggest_spelling(query):
-    """Suggest a spelling correction for the query based on known artist names."""
+def suggest_spellings(query, limit=5):
+    """Get ranked spelling corrections for the query (closest, most common first)."""
     query_lower = query.lower().strip()
 
     # Don't suggest for very short queries
     if len(query_lower) < 3:
-        return None
-
-    best_match = None
-    best_distance = float('inf')
+        return []
 
-    for artist in KNOWN_ARTISTS:
-        artist_lower = artist.lower()
+    if _spelling_built_at is None or time.time() - _spelling_built_at > SPELLING_REFRESH_HOURS * 3600:
+        warm_spelling_index()
 
-        # Check each word in multi-word artist names
-        artist_words = artist_lower.split()
-        for word in artist_words:
-            if len(word) < 3:
-                continue
+    index = _spelling_index
+    # A query that is already a known name is spelled correctly
+    if query_lower in index:
+        return []
 
-            distance = _levenshtein_distance(query_lower, word)
-
-            # Also check against full name
-            full_distance = _levenshtein_distance(query_lower, artist_lower)
-
-            min_distance = min(distance, full_distance)
-
-            # Threshold: allow up to 2 character differences for short words,
-            # or roughly 30% of word length for longer words
-            threshold = max(2, len(query_lower) // 3)
+    suggestions = []
+    for _, value, _ in index.lookup(query_lower):
+        if value not in suggestions:
+            suggestions.append(value)
+            if len(suggestions) >= limit:
+                break
+    return suggestions
 
-            if min_distance <= threshold and min_distance < best_distance and min_distance > 0:
-                best_distance = min_distance
-                best_match = artist
 
-    return best_match
+def suggest_spelling(query):
+    """Suggest a spelling correction for the query based on known artist and title names."""
+    suggestions = suggest_spellings(query, limit=1)
+    return suggestions[0] if suggestions else None
 
 
 def _cache_key(prefix, url, params):
@@ -173,26 +326,305 @@ def _cache_key(prefix, url, params):
     return f"{prefix}:{hashlib.md5(key_str.encode()).hexdigest()}"
 
 
-def _make_request(url, params=None, cache_prefix=None):
-    """Make an API request with optional caching."""
-    if cache_prefix:
-        key = _cache_key(cache_prefix, url, params)
-        cached = get_cached_response(key)
-        if cached:
+def _get_session(url):
+    """Get the pooled keep-alive session for a URL's host (created on first use)."""
+    host = urlparse(url).netloc
+    session = _http_sessions.get(host)
+    if session is not None:
+        return session
+
+    with _http_sessions_lock:
+        session = _http_sessions.get(host)
+        if session is None:
+            retry = _CappedRetry(
+                total=HTTP_MAX_RETRIES,
+                read=HTTP_READ_RETRIES,
+                backoff_factor=HTTP_BACKOFF_FACTOR,
+                status_forcelist=HTTP_RETRY_STATUSES,
+                allowed_methods=frozenset(["GET", "HEAD"]),
+                respect_retry_after_header=True,
+                raise_on_status=False  # Let raise_for_status() report the final response
+            )
+            adapter = HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=HTTP_POOL_SIZE,
+                pool_block=False,
+                max_retries=retry
+            )
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _http_sessions[host] = session
+    return session
+
+
+def _http_get(url, params=None, timeout=REQUEST_TIMEOUT, **kwargs):
+    """GET a URL through the host's pooled session."""
+    return _get_session(url).get(url, params=params, timeout=timeout, **kwargs)
+
+
+def _make_request(url, params=None, cache_prefix=None, formatter=None):
+    """Make an API request with optional caching.
+
+    With a formatter, the response is passed through it before caching, so
+    hits return the compact formatted result without re-parsing the raw JSON.
+    Results are copied, so callers may modify them freely.
+
+    Cached entries are kept for the prefix's TTL (see cache_policy). An
+    expired entry is still returned for up to the stale window while a
+    background refresh replaces it. Refreshes send the upstream ETag /
+    Last-Modified, so an unchanged record only has its expiry extended.
+    """
+    if not cache_prefix:
+        data = _fetch_json(url, params)
+        return formatter(data) if data and formatter else data
+
+    if formatter:
+        key = _formatted_cache_key(cache_prefix, url, params)
+        return copy.deepcopy(_cached_request(url, params, key, cache_prefix, formatter))
+    return _cached_request(url, params, _cache_key(cache_prefix, url, params), cache_prefix, None)
+
+
+def _formatted_cache_key(cache_prefix, url, params):
+    """Get the cache key for a formatted response (see CACHE_FORMAT_VERSION)."""
+    return _cache_key(f"{cache_prefix}_f{CACHE_FORMAT_VERSION}", url, params)
+
+
+def _cached_request(url, params, key, cache_prefix, formatter):
+    """Look up both cache tiers, fetching from upstream on a miss."""
+    ttl_hours, stale_hours = cache_policy(cache_prefix)
+
+    if getattr(_request_state, "skip_cache", False):
+        # Already looked up in bulk, or a forced refresh - go upstream and
+        # overwrite both tiers
+        memory_cache.delete(key)
+        return inflight.do(key, lambda: _fetch_and_cache(key, url, params, ttl_hours, formatter))
+
+    # In-process tiers first, then the shared Supabase tier
+    cached = memory_cache.get(key)
+    if cached:
+        return cached
+    if _negative_hit(key):
+        return None
+    entry = get_cached_entry(key)
+    stale = None
+    if entry and entry["response_data"]:
+        cached = _decompress(entry["response_data"])
+        expires_at = entry["expires_at"]
+        remaining = (expires_at - datetime.now(timezone.utc)).total_seconds() if expires_at else ttl_hours * 3600
+        if cached == _NOT_FOUND_MARKER:
+            # Shared 404 from another worker - never served stale
+            if remaining > 0:
+                negative_cache.set(key, "not_found", ttl_seconds=min(NEGATIVE_CACHE_NOT_FOUND_SECONDS, remaining))
+                _request_state.not_found = True
+                return None
+        elif remaining > 0:
+            memory_cache.set(key, cached, ttl_seconds=min(memory_cache.ttl_seconds, remaining))
             return cached
+        else:
+            stale = {"data": cached, "etag": entry.get("etag"), "last_modified": entry.get("last_modified")}
+            if -remaining <= stale_hours * 3600:
+                _queue_revalidation(key, url, params, ttl_hours, formatter, stale)
+                return cached
+
+    # Hedged requests must not join the in-flight call they are hedging
+    if getattr(_request_state, "hedged", False):
+        return _fetch_and_cache(key, url, params, ttl_hours, formatter, stale)
+
+    # Concurrent misses for the same key share a single upstream fetch
+    return inflight.do(key, lambda: _fetch_and_cache(key, url, params, ttl_hours, formatter, stale))
+
+
+def _fetch_and_cache(key, url, params, ttl_hours, formatter=None, stale=None):
+    """Fetch from upstream and fill both cache tiers (single-flight leader).
+
+    stale is an expired entry ({"data", "etag", "last_modified"}); its
+    validators make the request conditional, and a 304 keeps its data.
+    """
+    # A previous leader may have filled the cache since our lookup
+    cached = memory_cache.get(key)
+    if cached:
+        return cached
+
+    validators = {k: stale[k] for k in ("etag", "last_modified") if stale.get(k)} if stale else None
+    data, error, new_validators = _fetch_json_status(url, params, validators)
+    if validators:
+        with _revalidate_lock:
+            _revalidate_stats["conditional"] += 1
+    if error == "not_modified":
+        # Unchanged upstream - keep the cached data and just extend it
+        with _revalidate_lock:
+            _revalidate_stats["not_modified"] += 1
+        data = stale["data"]
+        memory_cache.set(key, data, ttl_seconds=min(memory_cache.ttl_seconds, ttl_hours * 3600))
+        extend_cached_response(key, ttl_hours=ttl_hours)
+        return data
 
-    try:
-        response = requests.get(url, params=params, timeout=REQUEST_TIMEOUT)
-        response.raise_for_status()
-        data = response.json()
+    if data and formatter:
+        data = formatter(data)
+    if data:
+        memory_cache.set(key, data, ttl_seconds=min(memory_cache.ttl_seconds, ttl_hours * 3600))
+        set_cached_response(key, _compress(data), ttl_hours=ttl_hours, **new_validators)
+    elif error == "not_found":
+        # Missing objects stay missing - remember for longer and share across workers
+        negative_cache.set(key, error, ttl_seconds=NEGATIVE_CACHE_NOT_FOUND_SECONDS)
+        set_cached_response(key, _NOT_FOUND_MARKER, ttl_hours=NEGATIVE_CACHE_NOT_FOUND_SECONDS / 3600)
+    elif stale is None:
+        # Timeouts, server errors and empty bodies are retried after a short pause.
+        # Not after a failed revalidation - the stale copy should keep being served
+        negative_cache.set(key, error or "empty")
+    return data
+
+
+# Stored in api_cache in place of a response the museum answered with 404
+_NOT_FOUND_MARKER = {"not_found": True}
+
+
+def _compress(data):
+    """Wrap a response as gzipped JSON for api_cache if CACHE_COMPRESS is on."""
+    if not CACHE_COMPRESS:
+        return data
+    raw = gzip.compress(json.dumps(data, separators=(",", ":")).encode("utf-8"))
+    return {"gz": base64.b64encode(raw).decode("ascii")}
+
+
+def _decompress(data):
+    """Unwrap a response stored by _compress (plain responses pass through)."""
+    if isinstance(data, dict) and len(data) == 1 and "gz" in data:
+        return json.loads(gzip.decompress(base64.b64decode(data["gz"])))
+    return data
+
+
+def _negative_hit(key):
+    """Check the negative cache, replaying the miss into the request state."""
+    reason = negative_cache.get(key)
+    if reason is None:
+        return False
+    if reason == "not_found":
+        _request_state.not_found = True
+    elif reason == "error":
+        # Still a failure as far as federated search's breakers are concerned
+        _request_state.failures = getattr(_request_state, "failures", 0) + 1
+    return True
+
+
+_revalidate_queue = queue.Queue(maxsize=CACHE_REVALIDATE_QUEUE_SIZE)
+_revalidate_pending = set()  # Cache keys queued or being refreshed
+_revalidate_lock = threading.Lock()
+_revalidate_thread = None
+_last_cache_purge = None  # monotonic time of this process's last api_cache purge
+_revalidate_stats = {
+    "stale_served": 0, "refreshed": 0, "failed": 0, "dropped": 0,
+    "conditional": 0, "not_modified": 0
+}
 
-        if cache_prefix:
-            set_cached_response(key, data)
 
-        return data
+def _queue_revalidation(key, url, params, ttl_hours, formatter=None, stale=None):
+    """Queue a background refresh of a stale cache entry (once per key)."""
+    global _revalidate_thread
+
+    with _revalidate_lock:
+        _revalidate_stats["stale_served"] += 1
+        if key in _revalidate_pending:
+            return
+        try:
+            _revalidate_queue.put_nowait((key, url, params, ttl_hours, formatter, stale))
+        except queue.Full:
+            _revalidate_stats["dropped"] += 1
+            return  # Queued again on a later read
+        _revalidate_pending.add(key)
+
+        if _revalidate_thread is None:
+            _revalidate_thread = threading.Thread(
+                target=_revalidate_worker, name="cache-revalidate", daemon=True
+            )
+            _revalidate_thread.start()
+
+
+def _revalidate_worker():
+    """Drain the revalidation queue, refreshing one stale entry at a time."""
+    while True:
+        key, url, params, ttl_hours, formatter, stale = _revalidate_queue.get()
+        try:
+            # Join a foreground fetch of the same key if one is running
+            data = inflight.do(key, lambda: _fetch_and_cache(key, url, params, ttl_hours, formatter, stale))
+            outcome = "refreshed" if data else "failed"
+        except Exception as e:
+            print(f"Cache revalidation failed: {e}")
+            outcome = "failed"
+        with _revalidate_lock:
+            _revalidate_stats[outcome] += 1
+            _revalidate_pending.discard(key)
+        _maybe_purge_cache()
+
+
+def _maybe_purge_cache():
+    """Delete dead api_cache rows, at most once every CACHE_PURGE_HOURS."""
+    global _last_cache_purge
+    if not USE_LOCAL_DB:
+        return
+    if _last_cache_purge is not None and time.monotonic() - _last_cache_purge < CACHE_PURGE_HOURS * 3600:
+        return
+    _last_cache_purge = time.monotonic()
+    deleted = clear_old_cache()
+    print(f"Purged {deleted} dead cache entries")
+
+
+def _fetch_json(url, params=None):
+    """GET a URL and decode its JSON body, returning None on failure."""
+    data, _, _ = _fetch_json_status(url, params)
+    return data
+
+
+def _fetch_json_status(url, params=None, validators=None):
+    """GET a URL and decode its JSON body.
+
+    validators ({"etag", "last_modified"}) make the request conditional.
+    Returns (data, error, validators) where error is None, "not_modified"
+    for a 304, "not_found" for a 404 (neither counted as a failure) or
+    "error" for any other failure, and validators are the response's.
+    """
+    headers = {}
+    if validators:
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+
+    try:
+        response = _http_get(url, params=params, headers=headers or None)
+        if response.status_code == 304:
+            return None, "not_modified", {}
+        if response.status_code == 404:
+            _request_state.not_found = True
+            return None, "not_found", {}
+        response.raise_for_status()
+        new_validators = {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified")
+        }
+        return response.json(), None, new_validators
     except requests.RequestException as e:
         print(f"API request failed: {e}")
-        return None
+        _request_state.failures = getattr(_request_state, "failures", 0) + 1
+        return None, "error", {}
+
+
+def _compact_search(items, total, format_item):
+    """Format search hits into the cached {"paintings", "total"} form, keeping those with images."""
+    paintings = []
+    for item in items:
+        painting = format_item(item)
+        if painting and painting.get("image_url"):
+            paintings.append(painting)
+    return {"paintings": paintings, "total": total}
+
+
+def _search_page(data, page):
+    """Build a search response from a cached {"paintings", "total"} result."""
+    if not data:
+        return {"paintings": [], "total": 0, "page": page}
+    return {"paintings": data["paintings"], "total": data["total"], "page": page}
 
 
 # Art Institute of Chicago API
@@ -209,40 +641,64 @@ def aic_search(query, page=1, limit=20):
     data = _make_request(
         f"{AIC_BASE_URL}/artworks/search",
         params,
-        cache_prefix="aic_search"
+        cache_prefix="aic_search",
+        formatter=_format_aic_search
     )
 
-    if not data:
-        return {"paintings": [], "total": 0, "page": page}
+    return _search_page(data, page)
 
-    paintings = []
+
+def _format_aic_search(data):
+    """Format an Art Institute of Chicago search response."""
     iiif_url = data.get("config", {}).get("iiif_url", "https://www.artic.edu/iiif/2")
+    return _compact_search(
+        data.get("data", []),
+        data.get("pagination", {}).get("total", 0),
+        lambda item: _format_aic_painting(item, iiif_url)
+    )
 
-    for item in data.get("data", []):
-        if item.get("image_id"):
-            paintings.append(_format_aic_painting(item, iiif_url))
 
-    return {
-        "paintings": paintings,
-        "total": data.get("pagination", {}).get("total", 0),
-        "page": page
-    }
+AIC_DETAIL_FIELDS = "id,title,artist_title,date_display,medium_display,dimensions,thumbnail,image_id,artwork_type_title,style_title,description,provenance_text,publication_history,exhibition_history"
 
 
 def aic_get_painting(artwork_id):
     """Get a single painting from Art Institute of Chicago."""
-    data = _make_request(
-        f"{AIC_BASE_URL}/artworks/{artwork_id}",
-        {"fields": "id,title,artist_title,date_display,medium_display,dimensions,thumbnail,image_id,artwork_type_title,style_title,description,provenance_text,publication_history,exhibition_history"},
-        cache_prefix="aic_artwork"
-    )
+    url, params = _aic_detail_request(artwork_id)
+    data = _make_request(url, params, cache_prefix="aic_artwork", formatter=_format_aic_artwork)
+
+    return data
 
-    if not data or "data" not in data:
-        return None
 
-    item = data["data"]
+def _aic_detail_request(artwork_id):
+    """Get the URL and params for one AIC artwork (also used for batch cache keys)."""
+    return f"{AIC_BASE_URL}/artworks/{artwork_id}", {"fields": AIC_DETAIL_FIELDS}
+
+
+def _aic_fetch_batch(artwork_ids):
+    """Fetch up to BATCH_FETCH_SIZE AIC artworks in one request, as {external_id: painting}."""
+    data = _fetch_json(f"{AIC_BASE_URL}/artworks", {
+        "ids": ",".join(artwork_ids),
+        "fields": AIC_DETAIL_FIELDS,
+        "limit": len(artwork_ids)
+    })
+    if not data:
+        return {}
+
     iiif_url = data.get("config", {}).get("iiif_url", "https://www.artic.edu/iiif/2")
-    return _format_aic_painting(item, iiif_url)
+    paintings = {}
+    for item in data.get("data") or []:
+        if item:
+            painting = _format_aic_painting(item, iiif_url)
+            paintings[painting["external_id"]] = painting
+    return paintings
+
+
+def _format_aic_artwork(data):
+    """Format an Art Institute of Chicago artwork response."""
+    if "data" not in data:
+        return None
+    iiif_url = data.get("config", {}).get("iiif_url", "https://www.artic.edu/iiif/2")
+    return _format_aic_painting(data["data"], iiif_url)
 
 
 def _format_aic_painting(item, iiif_url):
@@ -298,57 +754,359 @@ NAMESPACES = {
     'skos': 'http://www.w3.org/2004/02/skos/core#',
 }
 
+_RECORD_TAG = '{http://www.openarchives.org/OAI/2.0/}record'
+_AGENT_TAG = '{http://www.europeana.eu/schemas/edm/}Agent'
+_DESCRIPTION_TAG = '{http://www.w3.org/1999/02/22-rdf-syntax-ns#}Description'
+_RDF_ABOUT = '{http://www.w3.org/1999/02/22-rdf-syntax-ns#}about'
+_XML_LANG = '{http://www.w3.org/XML/1998/namespace}lang'
+
+# Page-level markers, read from the raw bytes so the next page can be fetched
+# while this one is still being parsed
+_OAI_ERROR_RE = re.compile(rb'<(?:\w+:)?error\b[^>]*\bcode="([^"]+)"')
+_RESUMPTION_TOKEN_RE = re.compile(rb'<(?:\w+:)?resumptionToken\b[^>]*>([^<]+)</')
+
+
+_rijks_oai_ids = {}         # OAI identifier -> external_id, for applying deletions
+_rijks_harvested_on = None  # Date of the last complete harvest, sent as OAI from=
+_rijks_saved_at = 0         # Epoch seconds of the last harvest or refresh
+_rijks_snapshot_mtime = None  # mtime of the snapshot file we last read or wrote
+_rijks_load_lock = threading.Lock()
+_rijks_refresh_lock = threading.Lock()
+_rijks_thread_lock = threading.Lock()
+_rijks_background_thread = None
+
 
-def _load_rijks_paintings():
-    """Load Rijksmuseum paintings from OAI-PMH API (cached in memory)."""
-    global _rijks_paintings_cache
+def _load_rijks_paintings(block=True, workers=0):
+    """Load Rijksmuseum paintings from memory, the disk snapshot, or OAI-PMH.
 
+    With block=False a cold cache returns [] straight away and the load
+    continues in the background, so searches never wait on it. A stale
+    catalogue is refreshed incrementally in the background. workers > 1
+    parses a full load in a process pool (harvest CLI only).
+    """
     if _rijks_paintings_cache is not None:
+        if _rijks_is_stale():
+            _start_rijks_background(_refresh_rijks_paintings)
         return _rijks_paintings_cache
 
-    print("Loading Rijksmuseum paintings from OAI-PMH (first search may take a moment)...")
-    paintings = []
+    if not block:
+        warm_rijks_paintings()
+        return []
+
+    with _rijks_load_lock:
+        if _rijks_paintings_cache is None:
+            if _load_rijks_snapshot():
+                if _rijks_is_stale():
+                    _start_rijks_background(_refresh_rijks_paintings)
+            else:
+                _refresh_rijks_paintings(full=True, workers=workers)
+    return _rijks_paintings_cache or []
+
+
+def warm_rijks_paintings():
+    """Start loading the Rijksmuseum catalogue in the background (app startup)."""
+    _start_rijks_background(_load_rijks_paintings)
+
+
+def _start_rijks_background(target):
+    """Run a Rijksmuseum load/refresh on a daemon thread unless one is running."""
+    global _rijks_background_thread
+    with _rijks_thread_lock:
+        if _rijks_background_thread is not None and _rijks_background_thread.is_alive():
+            return
+        _rijks_background_thread = threading.Thread(target=target, name="rijks-loader", daemon=True)
+        _rijks_background_thread.start()
+
+
+def _rijks_is_stale():
+    """Check whether the catalogue is due a refresh.
+
+    A catalogue that has never had a complete harvest is retried, but no
+    sooner than RIJKS_RETRY_MINUTES after the last attempt, so an upstream
+    outage doesn't start a new harvest on every search.
+    """
+    age = time.time() - _rijks_saved_at
+    if _rijks_harvested_on is None:
+        return age > RIJKS_RETRY_MINUTES * 60
+    return age > RIJKS_REFRESH_HOURS * 3600
+
+
+@contextmanager
+def _rijks_file_lock():
+    """Hold an exclusive lock shared by every process using the snapshot.
+
+    Only one gunicorn worker harvests at a time; the others wait here and
+    then pick up the snapshot it wrote.
+    """
+    if fcntl is None:
+        yield
+        return
+    with open(f"{RIJKS_SNAPSHOT_PATH}.lock", "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
 
-    # Fetch from set 261208 (schilderijen/paintings)
+
+def _snapshot_mtime():
+    """Get the snapshot file's mtime, or None if there isn't one."""
+    try:
+        return os.path.getmtime(RIJKS_SNAPSHOT_PATH)
+    except OSError:
+        return None
+
+
+def _set_rijks_paintings(paintings, oai_ids, harvested_on, saved_at):
+    """Swap in a new catalogue and its search index (readers keep whichever they hold)."""
+    global _rijks_paintings_cache, _rijks_index, _rijks_by_id
+    global _rijks_oai_ids, _rijks_harvested_on, _rijks_saved_at
+    _rijks_index = TextIndex(paintings, ("title", "artist", "description"))
+    _rijks_by_id = {p.get("external_id"): p for p in paintings}
+    _rijks_oai_ids = oai_ids
+    _rijks_harvested_on = harvested_on
+    _rijks_saved_at = saved_at
+    _rijks_paintings_cache = paintings
+
+
+def _load_rijks_snapshot():
+    """Load the catalogue from the disk snapshot. Returns False if there isn't one."""
+    global _rijks_snapshot_mtime
+    mtime = _snapshot_mtime()
+    if mtime is None:
+        return False
+    try:
+        with gzip.open(RIJKS_SNAPSHOT_PATH, "rt", encoding="utf-8") as f:
+            snapshot = json.load(f)
+        _set_rijks_paintings(
+            snapshot["paintings"],
+            snapshot.get("oai_ids", {}),
+            snapshot.get("harvested_on"),
+            snapshot.get("saved_at", 0)
+        )
+        _rijks_snapshot_mtime = mtime
+        print(f"Loaded {len(snapshot['paintings'])} Rijksmuseum paintings from snapshot")
+        return True
+    except Exception as e:
+        print(f"Error reading Rijksmuseum snapshot: {e}")
+        return False
+
+
+def _save_rijks_snapshot():
+    """Write the catalogue to disk atomically (safe across gunicorn workers)."""
+    global _rijks_snapshot_mtime
+    snapshot = {
+        "harvested_on": _rijks_harvested_on,
+        "saved_at": _rijks_saved_at,
+        "oai_ids": _rijks_oai_ids,
+        "paintings": _rijks_paintings_cache,
+    }
+    tmp_path = f"{RIJKS_SNAPSHOT_PATH}.{os.getpid()}.tmp"
+    try:
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(snapshot, f, separators=(",", ":"))
+        os.replace(tmp_path, RIJKS_SNAPSHOT_PATH)
+        _rijks_snapshot_mtime = _snapshot_mtime()
+    except Exception as e:
+        print(f"Error saving Rijksmuseum snapshot: {e}")
+
+
+def _refresh_rijks_paintings(full=False, workers=0):
+    """Harvest Rijksmuseum paintings via OAI-PMH and save the snapshot.
+
+    Incremental refreshes ask only for records changed since the last
+    complete harvest (OAI from=) and merge them into the current catalogue.
+    """
+    with _rijks_refresh_lock, _rijks_file_lock():
+        # Another worker may have harvested while we waited for the lock
+        mtime = _snapshot_mtime()
+        if mtime is not None and mtime != _rijks_snapshot_mtime:
+            if _load_rijks_snapshot():
+                if not _rijks_is_stale():
+                    return _rijks_paintings_cache
+                full = False  # Build on the catalogue we just loaded
+
+        since = None if full else _rijks_harvested_on
+        started_on = datetime.utcnow().strftime("%Y-%m-%d")
+
+        if since:
+            print(f"Refreshing Rijksmuseum paintings changed since {since}...")
+            by_id = {p["external_id"]: p for p in (_rijks_paintings_cache or [])}
+            oai_ids = dict(_rijks_oai_ids)
+        else:
+            print("Loading Rijksmuseum paintings from OAI-PMH (first search may take a moment)...")
+            by_id = {}
+            oai_ids = {}
+
+        if since:
+            records, complete = _fetch_rijks_records(since)
+        else:
+            records, complete = _fetch_rijks_records(max_pages=RIJKS_MAX_PAGES, workers=workers)
+
+        for oai_id, painting, deleted in records:
+            if deleted:
+                by_id.pop(oai_ids.pop(oai_id, None), None)
+            elif painting and painting.get('image_url'):
+                by_id[painting['external_id']] = painting
+                oai_ids[oai_id] = painting['external_id']
+
+        # Only advance from= after a complete harvest, so failed pages are retried
+        if complete:
+            harvested_on = started_on
+        else:
+            harvested_on = since
+        _set_rijks_paintings(list(by_id.values()), oai_ids, harvested_on, time.time())
+        _save_rijks_snapshot()
+
+        print(f"Loaded {len(by_id)} Rijksmuseum paintings ({len(records)} records fetched)")
+        return _rijks_paintings_cache
+
+
+def _fetch_rijks_records(since=None, max_pages=None, workers=0):
+    """Fetch OAI-PMH records from the paintings set.
+
+    Pages are fetched in sequence (each resumption token comes from the
+    previous page). With workers > 1 they are handed to a process pool for
+    parsing, so parsing overlaps with the next download - only from the
+    harvest CLI, never inside a threaded web worker. Returns
+    ([(oai_identifier, painting_or_None, deleted)], complete).
+    """
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=_parse_pool_context()) if workers > 1 else None
+    pages = []  # Parsed record lists (or futures of them), in page order
+    complete = True
     resumption_token = None
-    max_pages = 50  # More pages to get better coverage of paintings
+    page = 0
 
-    for page in range(max_pages):
-        try:
+    try:
+        while max_pages is None or page < max_pages:
+            page += 1
+
+            # Fetch from set 261208 (schilderijen/paintings)
             if resumption_token:
                 url = f"{RIJKS_OAI_URL}?verb=ListRecords&resumptionToken={resumption_token}"
             else:
                 url = f"{RIJKS_OAI_URL}?verb=ListRecords&metadataPrefix=edm&set=261208"
+                if since:
+                    url += f"&from={since}"
+
+            try:
+                response = _http_get(url)
+                response.raise_for_status()
+                content = response.content
+            except Exception as e:
+                print(f"Error loading Rijksmuseum data: {e}")
+                complete = False
+                break
 
-            response = requests.get(url, timeout=REQUEST_TIMEOUT)
-            response.raise_for_status()
-
-            root = ET.fromstring(response.content)
+            # "No records match" is how OAI-PMH reports an empty incremental window
+            error = _OAI_ERROR_RE.search(content, 0, 4096)
+            if error:
+                complete = error.group(1) == b'noRecordsMatch'
+                if not complete:
+                    print(f"Rijksmuseum OAI-PMH error: {error.group(1).decode()}")
+                break
 
-            # Parse records
-            for record in root.findall('.//oai:record', NAMESPACES):
-                painting = _parse_rijks_oai_record(record)
-                if painting and painting.get('image_url'):
-                    paintings.append(painting)
+            pages.append(pool.submit(_parse_rijks_page, content) if pool else content)
 
             # Check for resumption token
-            token_elem = root.find('.//oai:resumptionToken', NAMESPACES)
-            if token_elem is not None and token_elem.text:
-                resumption_token = token_elem.text
-            else:
+            token = _RESUMPTION_TOKEN_RE.search(content, max(0, len(content) - 4096))
+            if not token or not token.group(1).strip():
                 break  # No more pages
+            resumption_token = unescape(token.group(1).strip().decode())
+
+        records = []
+        for parsed in pages:
+            try:
+                records.extend(parsed.result() if pool else _parse_rijks_page(parsed))
+            except Exception as e:
+                print(f"Error parsing Rijksmuseum page: {e}")
+                complete = False
+        return records, complete
+    finally:
+        if pool:
+            pool.shutdown(cancel_futures=True)
+
+
+def _parse_pool_context():
+    """Get a start method for the parse pool that doesn't fork this process.
+
+    The pool is started from the rijks-loader thread inside a threaded web
+    worker, and forking a multi-threaded process can deadlock the child on a
+    lock some other thread held. forkserver (or spawn where it's missing)
+    starts workers from a clean single-threaded process instead.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def _parse_rijks_page(content):
+    """Stream-parse one ListRecords page into (oai_identifier, painting, deleted) tuples.
+
+    Uses iterparse and clears each record once parsed, so the page is never
+    held as a full tree. Creator labels are collected into one lookup table
+    per page as their elements stream past, instead of being searched for
+    per record. Runs in a worker process during full loads.
+    """
+    records = []
+    creators = {"agents": {}, "descriptions": {}}
+
+    for _, elem in ET.iterparse(io.BytesIO(content), events=("end",)):
+        if elem.tag == _AGENT_TAG or elem.tag == _DESCRIPTION_TAG:
+            _add_creator_label(creators, elem)
+        elif elem.tag == _RECORD_TAG:
+            header = elem.find('oai:header', NAMESPACES)
+            if header is not None:
+                oai_id = header.findtext('oai:identifier', '', NAMESPACES)
+                if header.get('status') == 'deleted':
+                    records.append((oai_id, None, True))
+                else:
+                    records.append((oai_id, _parse_rijks_oai_record(elem, creators), False))
+            elem.clear()
+
+    return records
+
+
+def _add_creator_label(creators, elem):
+    """Add an edm:Agent or rdf:Description label to the creator lookup table."""
+    about = elem.get(_RDF_ABOUT)
+    if not about:
+        return
+
+    if elem.tag == _AGENT_TAG:
+        if about in creators["agents"]:
+            return
+        # Prefer English label
+        label_text = None
+        for label in elem.findall('skos:prefLabel', NAMESPACES):
+            if label.text:
+                if label.get(_XML_LANG, '') == 'en':
+                    label_text = label.text
+                    break
+                elif label_text is None:
+                    label_text = label.text
+        if label_text:
+            creators["agents"][about] = label_text
+    else:
+        label = elem.find('skos:prefLabel', NAMESPACES)
+        if label is not None and label.text:
+            creators["descriptions"].setdefault(about, label.text)
 
-        except Exception as e:
-            print(f"Error loading Rijksmuseum data: {e}")
-            break
 
-    print(f"Loaded {len(paintings)} Rijksmuseum paintings")
-    _rijks_paintings_cache = paintings
-    return paintings
+def _collect_creator_labels(metadata):
+    """Build the creator lookup table for a single record."""
+    creators = {"agents": {}, "descriptions": {}}
+    for elem in metadata.iter():
+        if elem.tag == _AGENT_TAG or elem.tag == _DESCRIPTION_TAG:
+            _add_creator_label(creators, elem)
+    return creators
+
 
+def _parse_rijks_oai_record(record, creators=None):
+    """Parse a single OAI-PMH record into painting data.
 
-def _parse_rijks_oai_record(record):
-    """Parse a single OAI-PMH record into painting data."""
+    creators is the page's creator URI -> label table; built from the
+    record itself when not given.
+    """
     try:
         header = record.find('oai:header', NAMESPACES)
         metadata = record.find('oai:metadata', NAMESPACES)
@@ -414,34 +1172,16 @@ def _parse_rijks_oai_record(record):
                     if web_resource is not None:
                         image_url = web_resource.get('{http://www.w3.org/1999/02/22-rdf-syntax-ns#}about', '')
 
-        # Get artist from creator reference or look up
+        # Get artist from creator reference (edm:Agent first, then rdf:Description)
         artist = "Unknown Artist"
         creator_elem = cho.find('dc:creator', NAMESPACES)
         if creator_elem is not None:
             creator_ref = creator_elem.get('{http://www.w3.org/1999/02/22-rdf-syntax-ns#}resource', '')
-
-            # Try to find artist name in edm:Agent elements (primary source)
-            for agent in metadata.findall('.//edm:Agent', NAMESPACES):
-                if agent.get('{http://www.w3.org/1999/02/22-rdf-syntax-ns#}about') == creator_ref:
-                    # Prefer English label
-                    for label in agent.findall('skos:prefLabel', NAMESPACES):
-                        lang = label.get('{http://www.w3.org/XML/1998/namespace}lang', '')
-                        if label.text:
-                            if lang == 'en':
-                                artist = label.text
-                                break
-                            elif artist == "Unknown Artist":
-                                artist = label.text
-                    break
-
-            # Fallback: try rdf:Description elements
-            if artist == "Unknown Artist":
-                for desc in metadata.findall('.//rdf:Description', NAMESPACES):
-                    if desc.get('{http://www.w3.org/1999/02/22-rdf-syntax-ns#}about') == creator_ref:
-                        label = desc.find('skos:prefLabel', NAMESPACES)
-                        if label is not None and label.text:
-                            artist = label.text
-                            break
+            if creators is None:
+                creators = _collect_creator_labels(metadata)
+            artist = (creators["agents"].get(creator_ref)
+                      or creators["descriptions"].get(creator_ref)
+                      or "Unknown Artist")
 
         if not title:
             return None
@@ -467,20 +1207,14 @@ def _parse_rijks_oai_record(record):
 
 def rijks_search(query, page=1, limit=20):
     """Search Rijksmuseum collection using cached OAI-PMH data."""
-    paintings = _load_rijks_paintings()
+    paintings = _load_rijks_paintings(block=False)
+    index = _rijks_index
 
-    if not paintings:
+    if not paintings or index is None:
         return {"paintings": [], "total": 0, "page": page}
 
     # Search in title, artist, and description
-    query_lower = query.lower()
-    matches = []
-    for p in paintings:
-        if (query_lower in p.get('title', '').lower() or
-            query_lower in p.get('artist', '').lower() or
-            query_lower in p.get('description', '').lower()):
-            matches.append(p)
-
+    matches = index.search(query)
     total = len(matches)
 
     # Paginate
@@ -497,11 +1231,11 @@ def rijks_search(query, page=1, limit=20):
 
 def rijks_get_painting(object_number):
     """Get a single painting from Rijksmuseum by object number."""
-    paintings = _load_rijks_paintings()
+    _load_rijks_paintings(block=False)
 
-    for p in paintings:
-        if p.get('external_id') == object_number:
-            return p
+    painting = _rijks_by_id.get(object_number)
+    if painting:
+        return painting
 
     # If not in cache, try to fetch directly via OAI-PMH GetRecord
     try:
@@ -509,7 +1243,10 @@ def rijks_get_painting(object_number):
         identifier = f"https://id.rijksmuseum.nl/20{object_number.replace('-', '').replace('SK', '0').replace('A', '')}"
         url = f"{RIJKS_OAI_URL}?verb=GetRecord&metadataPrefix=edm&identifier={identifier}"
 
-        response = requests.get(url, timeout=REQUEST_TIMEOUT)
+        response = _http_get(url)
+        if b'code="idDoesNotExist"' in response.content[:4096]:
+            _request_state.not_found = True
+            return None
         root = ET.fromstring(response.content)
 
         record = root.find('.//oai:record', NAMESPACES)
@@ -528,7 +1265,8 @@ def met_search(query, page=1, limit=20):
     search_data = _make_request(
         f"{MET_BASE_URL}/search",
         {"q": query, "hasImages": "true", "departmentId": "11"},  # 11 = European Paintings
-        cache_prefix="met_search"
+        cache_prefix="met_search",
+        formatter=lambda data: {"objectIDs": data.get("objectIDs") or []}
     )
 
     if not search_data or "objectIDs" not in search_data:
@@ -542,9 +1280,11 @@ def met_search(query, page=1, limit=20):
     end = start + limit
     page_ids = object_ids[start:end]
 
+    # One bulk database/cache lookup, then concurrent fetches for the rest
+    found = get_paintings_batch("met", page_ids)
     paintings = []
     for obj_id in page_ids:
-        painting = met_get_painting(obj_id)
+        painting = found.get(str(obj_id))
         if painting and painting.get("image_url"):
             paintings.append(painting)
 
@@ -556,11 +1296,14 @@ def met_search(query, page=1, limit=20):
 
 
 def _fetch_met_description(object_url):
-    """Fetch the curatorial description from Met website (not in API)."""
+    """Fetch the curatorial description from Met website (not in API).
+
+    Returns "" if the page has no description and None if the fetch failed.
+    """
     if not object_url:
         return ""
     try:
-        response = requests.get(object_url, timeout=REQUEST_TIMEOUT)
+        response = _http_get(object_url)
         response.raise_for_status()
         html = response.text
 
@@ -577,32 +1320,128 @@ def _fetch_met_description(object_url):
             return best_desc
 
         return ""
-    except:
-        return ""
+    except Exception:
+        return None
 
 
-def met_get_painting(object_id):
-    """Get a single painting from Metropolitan Museum of Art."""
-    data = _make_request(
-        f"{MET_BASE_URL}/objects/{object_id}",
-        {},
-        cache_prefix="met_artwork"
-    )
+_met_enrichment_queue = queue.Queue(maxsize=MET_ENRICHMENT_QUEUE_SIZE)
+_met_enrichment_pending = set()
+_met_enrichment_lock = threading.Lock()
+_met_enrichment_thread = None
 
-    if not data:
+
+def queue_met_description(painting):
+    """Queue a Met painting for background description scraping.
+
+    The scraped text is stored in paintings.web_description (or the API
+    cache for paintings that aren't harvested), so each object is scraped
+    once and later reads are served from there.
+    """
+    global _met_enrichment_thread
+
+    if not USE_LOCAL_DB or not painting.get("museum_url"):
+        return
+
+    external_id = str(painting.get("external_id", ""))
+    with _met_enrichment_lock:
+        if external_id in _met_enrichment_pending:
+            return
+        try:
+            _met_enrichment_queue.put_nowait(painting)
+        except queue.Full:
+            return  # Picked up again on a later read
+        _met_enrichment_pending.add(external_id)
+
+        if _met_enrichment_thread is None:
+            _met_enrichment_thread = threading.Thread(
+                target=_met_enrichment_worker, name="met-enrichment", daemon=True
+            )
+            _met_enrichment_thread.start()
+
+
+def _met_enrichment_worker():
+    """Drain the enrichment queue, one Met page at a time."""
+    while True:
+        painting = _met_enrichment_queue.get()
+        try:
+            enrich_met_description(painting)
+        except Exception as e:
+            print(f"Met description enrichment failed: {e}")
+        finally:
+            with _met_enrichment_lock:
+                _met_enrichment_pending.discard(str(painting.get("external_id", "")))
+
+
+def enrich_met_description(painting):
+    """Scrape and store the website description for one Met painting.
+
+    Returns the description ("" if the page has none), or None if the
+    scrape failed and should be retried later.
+    """
+    description = _fetch_met_description(painting.get("museum_url"))
+    if description is None:
+        return None
+
+    external_id = str(painting.get("external_id", ""))
+    if not save_web_description("met", external_id, description):
+        # Not harvested - keep it in the API cache rather than adding an
+        # uncurated row to the paintings table
+        key = _met_description_key(external_id)
+        ttl_hours, _ = cache_policy("met_artwork")
+        set_cached_response(key, {"description": description}, ttl_hours=ttl_hours)
+        memory_cache.set(key, description, ttl_seconds=min(memory_cache.ttl_seconds, ttl_hours * 3600))
+    return description
+
+
+def _met_description_key(external_id):
+    """Get the cache key for a scraped description of an un-harvested Met painting."""
+    return f"met_description:{external_id}"
+
+
+def _cached_met_description(external_id):
+    """Get a cached scraped description ("" if the page had none), or None if not cached."""
+    key = _met_description_key(external_id)
+    description = memory_cache.get(key)
+    if description is not None:
+        return description
+    entry = get_cached_entry(key)
+    remaining = (entry["expires_at"] - datetime.now(timezone.utc)).total_seconds() if entry else 0
+    if remaining <= 0:
         return None
+    description = entry["response_data"].get("description", "")
+    memory_cache.set(key, description, ttl_seconds=min(memory_cache.ttl_seconds, remaining))
+    return description
 
-    result = _format_met_painting(data)
 
-    # Try to fetch the rich description from the website
-    if result.get("museum_url"):
-        web_description = _fetch_met_description(result["museum_url"])
-        if web_description:
-            result["description"] = web_description
+def met_get_painting(object_id, include_description=True):
+    """Get a single painting from Metropolitan Museum of Art.
+
+    include_description=False skips scraping the Met website for the
+    curatorial description (used by search/list views).
+    """
+    url, params = _met_detail_request(object_id)
+    result = _make_request(url, params, cache_prefix="met_artwork", formatter=_format_met_painting)
+
+    if not result:
+        return None
+
+    # The rich description is scraped from the website in the background
+    # and served from the database (or the API cache) on later reads
+    if include_description and USE_LOCAL_DB:
+        description = _cached_met_description(str(object_id))
+        if description is None:
+            queue_met_description(result)
+        elif description:
+            result["description"] = description
 
     return result
 
 
+def _met_detail_request(object_id):
+    """Get the URL and params for one Met object (also used for batch cache keys)."""
+    return f"{MET_BASE_URL}/objects/{object_id}", {}
+
+
 def _format_met_painting(item):
     """Format Met Museum painting data."""
     # Build description from available metadata
@@ -679,37 +1518,30 @@ def cleveland_search(query, page=1, limit=20):
     data = _make_request(
         f"{CLEVELAND_BASE_URL}/artworks/",
         params,
-        cache_prefix="cleveland_search"
+        cache_prefix="cleveland_search",
+        formatter=lambda data: _compact_search(
+            data.get("data", []), data.get("info", {}).get("total", 0), _format_cleveland_painting
+        )
     )
 
-    if not data:
-        return {"paintings": [], "total": 0, "page": page}
-
-    paintings = []
-    for item in data.get("data", []):
-        painting = _format_cleveland_painting(item)
-        if painting and painting.get("image_url"):
-            paintings.append(painting)
-
-    return {
-        "paintings": paintings,
-        "total": data.get("info", {}).get("total", 0),
-        "page": page
-    }
+    return _search_page(data, page)
 
 
 def cleveland_get_painting(artwork_id):
     """Get a single painting from Cleveland Museum of Art."""
+    url, params = _cleveland_detail_request(artwork_id)
     data = _make_request(
-        f"{CLEVELAND_BASE_URL}/artworks/{artwork_id}",
-        {},
-        cache_prefix="cleveland_artwork"
+        url, params,
+        cache_prefix="cleveland_artwork",
+        formatter=lambda data: _format_cleveland_painting(data["data"]) if "data" in data else None
     )
 
-    if not data or "data" not in data:
-        return None
+    return data
+
 
-    return _format_cleveland_painting(data["data"])
+def _cleveland_detail_request(artwork_id):
+    """Get the URL and params for one Cleveland artwork (also used for batch cache keys)."""
+    return f"{CLEVELAND_BASE_URL}/artworks/{artwork_id}", {}
 
 
 def _format_cleveland_painting(item):
@@ -773,23 +1605,13 @@ def harvard_search(query, page=1, limit=20):
     data = _make_request(
         f"{HARVARD_BASE_URL}/object",
         params,
-        cache_prefix="harvard_search"
+        cache_prefix="harvard_search",
+        formatter=lambda data: _compact_search(
+            data.get("records", []), data.get("info", {}).get("totalrecords", 0), _format_harvard_painting
+        )
     )
 
-    if not data:
-        return {"paintings": [], "total": 0, "page": page}
-
-    paintings = []
-    for item in data.get("records", []):
-        painting = _format_harvard_painting(item)
-        if painting and painting.get("image_url"):
-            paintings.append(painting)
-
-    return {
-        "paintings": paintings,
-        "total": data.get("info", {}).get("totalrecords", 0),
-        "page": page
-    }
+    return _search_page(data, page)
 
 
 def harvard_get_painting(object_id):
@@ -797,16 +1619,35 @@ def harvard_get_painting(object_id):
     if not HARVARD_API_KEY:
         return None
 
-    data = _make_request(
-        f"{HARVARD_BASE_URL}/object/{object_id}",
-        {"apikey": HARVARD_API_KEY},
-        cache_prefix="harvard_artwork"
-    )
+    url, params = _harvard_detail_request(object_id)
+    data = _make_request(url, params, cache_prefix="harvard_artwork", formatter=_format_harvard_painting)
+
+    return data
+
+
+def _harvard_detail_request(object_id):
+    """Get the URL and params for one Harvard object (also used for batch cache keys)."""
+    return f"{HARVARD_BASE_URL}/object/{object_id}", {"apikey": HARVARD_API_KEY}
+
 
+def _harvard_fetch_batch(object_ids):
+    """Fetch up to BATCH_FETCH_SIZE Harvard objects in one request, as {external_id: painting}."""
+    if not HARVARD_API_KEY:
+        return {}
+
+    data = _fetch_json(f"{HARVARD_BASE_URL}/object", {
+        "apikey": HARVARD_API_KEY,
+        "id": "|".join(object_ids),
+        "size": len(object_ids)
+    })
     if not data:
-        return None
+        return {}
 
-    return _format_harvard_painting(data)
+    paintings = {}
+    for item in data.get("records", []):
+        painting = _format_harvard_painting(item)
+        paintings[painting["external_id"]] = painting
+    return paintings
 
 
 def _format_harvard_painting(item):
@@ -863,23 +1704,13 @@ def europeana_search(query, page=1, limit=20):
     data = _make_request(
         f"{EUROPEANA_BASE_URL}/search.json",
         params,
-        cache_prefix="europeana_search"
+        cache_prefix="europeana_search",
+        formatter=lambda data: _compact_search(
+            data.get("items", []), data.get("totalResults", 0), _format_europeana_painting
+        )
     )
 
-    if not data:
-        return {"paintings": [], "total": 0, "page": page}
-
-    paintings = []
-    for item in data.get("items", []):
-        painting = _format_europeana_painting(item)
-        if painting and painting.get("image_url"):
-            paintings.append(painting)
-
-    return {
-        "paintings": paintings,
-        "total": data.get("totalResults", 0),
-        "page": page
-    }
+    return _search_page(data, page)
 
 
 def europeana_get_painting(record_id):
@@ -891,13 +1722,11 @@ def europeana_get_painting(record_id):
     data = _make_request(
         f"{EUROPEANA_BASE_URL}/{record_id}.json",
         {"wskey": EUROPEANA_API_KEY},
-        cache_prefix="europeana_artwork"
+        cache_prefix="europeana_artwork",
+        formatter=lambda data: _format_europeana_painting(data["object"]) if "object" in data else None
     )
 
-    if not data or "object" not in data:
-        return None
-
-    return _format_europeana_painting(data["object"])
+    return data
 
 
 def _format_europeana_painting(item):
@@ -973,23 +1802,15 @@ def smithsonian_search(query, page=1, limit=20):
     data = _make_request(
         f"{SMITHSONIAN_BASE_URL}/category/art_design/search",
         params,
-        cache_prefix="smithsonian_search"
+        cache_prefix="smithsonian_search",
+        formatter=lambda data: _compact_search(
+            data.get("response", {}).get("rows", []),
+            data.get("response", {}).get("rowCount", 0),
+            _format_smithsonian_painting
+        ) if "response" in data else None
     )
 
-    if not data or "response" not in data:
-        return {"paintings": [], "total": 0, "page": page}
-
-    paintings = []
-    for item in data["response"].get("rows", []):
-        painting = _format_smithsonian_painting(item)
-        if painting and painting.get("image_url"):
-            paintings.append(painting)
-
-    return {
-        "paintings": paintings,
-        "total": data["response"].get("rowCount", 0),
-        "page": page
-    }
+    return _search_page(data, page)
 
 
 def smithsonian_get_painting(record_id):
@@ -1000,13 +1821,11 @@ def smithsonian_get_painting(record_id):
     data = _make_request(
         f"{SMITHSONIAN_BASE_URL}/content/{record_id}",
         {"api_key": SMITHSONIAN_API_KEY},
-        cache_prefix="smithsonian_artwork"
+        cache_prefix="smithsonian_artwork",
+        formatter=lambda data: _format_smithsonian_painting(data["response"]) if "response" in data else None
     )
 
-    if not data or "response" not in data:
-        return None
-
-    return _format_smithsonian_painting(data["response"])
+    return data
 
 
 def _format_smithsonian_painting(item):
@@ -1092,23 +1911,11 @@ def smk_search(query, page=1, limit=20):
     data = _make_request(
         f"{SMK_BASE_URL}/art/search/",
         params,
-        cache_prefix="smk_search"
+        cache_prefix="smk_search",
+        formatter=lambda data: _compact_search(data.get("items", []), data.get("found", 0), _format_smk_painting)
     )
 
-    if not data:
-        return {"paintings": [], "total": 0, "page": page}
-
-    paintings = []
-    for item in data.get("items", []):
-        painting = _format_smk_painting(item)
-        if painting and painting.get("image_url"):
-            paintings.append(painting)
-
-    return {
-        "paintings": paintings,
-        "total": data.get("found", 0),
-        "page": page
-    }
+    return _search_page(data, page)
 
 
 def smk_get_painting(object_number):
@@ -1122,13 +1929,11 @@ def smk_get_painting(object_number):
     data = _make_request(
         f"{SMK_BASE_URL}/art/search/",
         params,
-        cache_prefix="smk_artwork"
+        cache_prefix="smk_artwork",
+        formatter=lambda data: _format_smk_painting(data["items"][0]) if data.get("items") else None
     )
 
-    if not data or not data.get("items"):
-        return None
-
-    return _format_smk_painting(data["items"][0])
+    return data
 
 
 def _format_smk_painting(item):
@@ -1243,23 +2048,13 @@ def whitney_search(query, page=1, limit=20):
     data = _make_request(
         url,
         None,  # Params already in URL
-        cache_prefix="whitney_search"
+        cache_prefix="whitney_search",
+        formatter=lambda data: _compact_search(
+            data.get("data", []), data.get("meta", {}).get("total", 0), _format_whitney_painting
+        )
     )
 
-    if not data:
-        return {"paintings": [], "total": 0, "page": page}
-
-    paintings = []
-    for item in data.get("data", []):
-        painting = _format_whitney_painting(item)
-        if painting and painting.get("image_url"):
-            paintings.append(painting)
-
-    return {
-        "paintings": paintings,
-        "total": data.get("meta", {}).get("total", 0),
-        "page": page
-    }
+    return _search_page(data, page)
 
 
 def whitney_get_painting(tms_id):
@@ -1267,13 +2062,11 @@ def whitney_get_painting(tms_id):
     data = _make_request(
         f"{WHITNEY_BASE_URL}/artworks/{tms_id}",
         {},
-        cache_prefix="whitney_artwork"
+        cache_prefix="whitney_artwork",
+        formatter=lambda data: _format_whitney_painting(data["data"]) if data.get("data") else None
     )
 
-    if not data or not data.get("data"):
-        return None
-
-    return _format_whitney_painting(data["data"])
+    return data
 
 
 def _format_whitney_painting(item):
@@ -1325,8 +2118,15 @@ def _format_whitney_painting(item):
 
 
 # Unified search function with parallel API calls
-def search_all(query, museum=None, page=1, limit=20):
-    """Search across all museums or a specific museum using parallel calls."""
+def search_all(query, museum=None, page=1, limit=20, deadline=None, cursor=None):
+    """Search across all museums or a specific museum using parallel calls.
+
+    Searches across all museums return a ranked, interleaved page plus a
+    "next_cursor"; pass it back as cursor to get the following page (page
+    numbers past 1 only apply to single-museum searches). Raises ValueError
+    for a federated page > 1 without a cursor, or a cursor that doesn't
+    belong to the query.
+    """
     if museum == "aic":
         return aic_search(query, page, limit)
     elif museum == "rijks":
@@ -1346,45 +2146,457 @@ def search_all(query, museum=None, page=1, limit=20):
     elif museum == "smithsonian":
         return smithsonian_search(query, page, limit)
     else:
-        # Search all museums in parallel
-        results = {"paintings": [], "total": 0, "page": page}
-        per_museum = max(limit // 7, 1)  # 7 main museums
-
-        # Create parallel tasks for all museum searches
-        with ThreadPoolExecutor(max_workers=7) as executor:
-            futures = {
-                executor.submit(aic_search, query, page, per_museum): "aic",
-                executor.submit(rijks_search, query, page, per_museum): "rijks",
-                executor.submit(met_search, query, page, per_museum): "met",
-                executor.submit(cleveland_search, query, page, per_museum): "cleveland",
-                executor.submit(harvard_search, query, page, per_museum): "harvard",
-                executor.submit(smk_search, query, page, per_museum): "smk",
-                executor.submit(whitney_search, query, page, per_museum): "whitney",
+        if page > 1 and not cursor:
+            raise ValueError("Pages after the first need the previous page's next_cursor")
+        return _federated_search(query, limit, deadline or SEARCH_DEADLINE_SECONDS, cursor)
+
+
+# Museums queried by an unfiltered search, with one circuit breaker each
+FEDERATED_SEARCHES = {
+    "aic": aic_search,
+    "rijks": rijks_search,
+    "met": met_search,
+    "cleveland": cleveland_search,
+    "harvard": harvard_search,
+    "smk": smk_search,
+    "whitney": whitney_search,
+}
+
+_circuit_breakers = {name: CircuitBreaker(name) for name in FEDERATED_SEARCHES}
+
+# One pool for every federated search in the process, keyed by museum
+_search_executor = BoundedExecutor(
+    "federated-search", SEARCH_EXECUTOR_WORKERS, SEARCH_EXECUTOR_QUEUE,
+    default_key_cap=SEARCH_MUSEUM_CONCURRENCY, key_caps=SEARCH_MUSEUM_CAPS
+)
+
+
+def _run_museum_search(search_func, query, position, count, hedged=False):
+    """Run one museum's search window, returning (window, failed)."""
+    _request_state.failures = 0
+    _request_state.hedged = hedged
+    try:
+        window = _search_window(search_func, query, position, count)
+    finally:
+        _request_state.hedged = False
+
+    # Search functions swallow request errors, so an empty window after a
+    # failed upstream call counts as a failure rather than "no matches"
+    failed = _request_state.failures > 0 and not window["items"]
+    return window, failed
+
+
+def _search_window(search_func, query, position, count):
+    """Get a museum's results from position on, reading whole upstream pages.
+
+    position is [page, index] into pages of FEDERATED_PAGE_SIZE results.
+    Pages are read until at least count results are collected or the
+    results run out. Returns {"items", "total", "exhausted"} where items are
+    (rank, painting, next_position) in the museum's own order.
+    """
+    page, index = position
+    items = []
+    total = 0
+    exhausted = False
+
+    for _ in range(FEDERATED_MAX_PAGES_PER_WINDOW):
+        failures = _request_state.failures
+        results = search_func(query, page, FEDERATED_PAGE_SIZE)
+        if _request_state.failures > failures:
+            break  # Keep what we have; this page is retried next time
+
+        total = results.get("total", 0)
+        batch = results.get("paintings", [])
+        for i in range(index, len(batch)):
+            next_position = [page, i + 1] if i + 1 < len(batch) else [page + 1, 0]
+            items.append(((page - 1) * FEDERATED_PAGE_SIZE + i, batch[i], next_position))
+
+        if page * FEDERATED_PAGE_SIZE >= total:
+            exhausted = True
+            break
+        if len(items) >= count:
+            break
+        page, index = page + 1, 0
+
+    return {"items": items, "total": total, "exhausted": exhausted}
+
+
+def _position_after(position, window, consumed):
+    """Get where a museum's results resume after using the first consumed items."""
+    items = window["items"]
+    if consumed == len(items) and window["exhausted"]:
+        return None  # Nothing left at this museum
+    if consumed == 0:
+        return position
+    return items[consumed - 1][2]
+
+
+def _start_positions(query, cursor):
+    """Get each museum's starting position from a cursor, or the first page.
+
+    A page number can't be turned into positions - how far each museum got
+    depends on how earlier pages were merged - so only cursors resume.
+    Raises ValueError for a cursor that is invalid or for another query.
+    """
+    if not cursor:
+        return {name: [1, 0] for name in FEDERATED_SEARCHES}
+    positions = decode_cursor(cursor, query)
+    if positions is None:
+        raise ValueError("Invalid cursor")
+    positions = {name: positions.get(name) for name in FEDERATED_SEARCHES}
+    if not all(position is None or _valid_position(position) for position in positions.values()):
+        raise ValueError("Invalid cursor")
+    return positions
+
+
+def _valid_position(position):
+    """Check a cursor position is [page, index] within the bounds _search_window produces."""
+    if not isinstance(position, list) or len(position) != 2:
+        return False
+    if not all(isinstance(n, int) and not isinstance(n, bool) for n in position):
+        return False
+    page, index = position
+    return 1 <= page <= FEDERATED_MAX_CURSOR_PAGE and 0 <= index < FEDERATED_PAGE_SIZE
+
+
+def _federated_search(query, limit, deadline, cursor=None):
+    """Search all museums in parallel within a latency budget.
+
+    Reads a window of results from each museum, starting where the cursor
+    left off, and merges them into one ranked, deduplicated page. Skipped
+    museums are listed and "partial" is set so callers know the results are
+    incomplete; they resume from the same place on the next page.
+    """
+    positions = _start_positions(query, cursor)
+    active = [name for name, position in positions.items() if position is not None]
+    # Twice a fair share each, so the page fills even if some museums run dry
+    count = min(limit, math.ceil(limit / max(len(active), 1)) * 2)
+
+    windows = {}
+    results = {"paintings": [], "total": 0}
+    for name, event in _iter_museum_windows(query, positions, count, deadline):
+        if name is None:
+            results["partial"] = event["partial"]
+            results["skipped"] = event["skipped"]
+        else:
+            windows[name] = event
+            results["total"] += event["total"]
+
+    merged, consumed = merge_ranked(
+        {name: [(rank, painting) for rank, painting, _ in window["items"]] for name, window in windows.items()},
+        query, limit
+    )
+    for name, window in windows.items():
+        positions[name] = _position_after(positions[name], window, consumed[name])
+
+    results["paintings"] = merged
+    results["has_more"] = any(position is not None for position in positions.values())
+    results["next_cursor"] = encode_cursor(query, positions) if results["has_more"] else None
+    return results
+
+
+def iter_federated_search(query, limit=20, deadline=None, cursor=None):
+    """Search all museums in parallel, yielding each museum's results as it lands.
+
+    Yields {"museum", "paintings", "total"} per museum in completion order,
+    then a final {"done": True, "partial", "skipped", "next_cursor"} summary.
+    Each museum streams up to its fair share of limit; the cursor resumes
+    after everything streamed, so pass it back for the next page. Raises
+    ValueError (before yielding anything) for an invalid cursor.
+    """
+    # Positions are resolved here rather than in the generator so a bad
+    # cursor fails before a streaming response has started
+    positions = _start_positions(query, cursor)
+    return _stream_federated(query, positions, limit, deadline or SEARCH_DEADLINE_SECONDS)
+
+
+def _stream_federated(query, positions, limit, deadline):
+    """Generator behind iter_federated_search."""
+    active = [name for name, position in positions.items() if position is not None]
+    count = max(math.ceil(limit / max(len(active), 1)), 1)
+
+    for name, event in _iter_museum_windows(query, positions, count, deadline):
+        if name is None:
+            has_more = any(position is not None for position in positions.values())
+            yield dict(event, done=True, next_cursor=encode_cursor(query, positions) if has_more else None)
+        else:
+            items = event["items"][:count]
+            positions[name] = _position_after(positions[name], event, len(items))
+            yield {
+                "museum": name,
+                "paintings": [painting for _, painting, _ in items],
+                "total": event["total"]
             }
 
-            # Collect results with timeout to prevent hanging
-            for future in as_completed(futures, timeout=20):
+
+def _iter_museum_windows(query, positions, count, deadline):
+    """Fetch a window from every museum in parallel within the deadline.
+
+    Yields (museum, window) as each lands, then (None, {"partial",
+    "skipped"}). Museums with no position left are not queried; museums
+    whose circuit is open, or that are at their concurrency cap on the
+    shared pool, are skipped up front; museums that fail or are still
+    running when the deadline passes are skipped and counted against their
+    breaker.
+    """
+    deadline = deadline or SEARCH_DEADLINE_SECONDS
+    skipped = []
+
+    started = time.monotonic()
+    deadline_at = started + deadline
+    hedge_at = started + SEARCH_HEDGE_AFTER_SECONDS if SEARCH_HEDGE_AFTER_SECONDS > 0 else None
+
+    futures = {}
+    attempts = {}
+    for name, search_func in FEDERATED_SEARCHES.items():
+        if positions.get(name) is None:
+            continue
+        if not _circuit_breakers[name].allow_request():
+            skipped.append(name)
+            continue
+        try:
+            future = _search_executor.submit(name, _run_museum_search, search_func, query, positions[name], count)
+        except ExecutorSaturated:
+            # Load shedding, not a museum failure - the breaker isn't charged
+            _circuit_breakers[name].release_probe()
+            skipped.append(name)
+            continue
+        futures[future] = name
+        attempts[name] = 1
+
+    pending = set(futures)
+    resolved = set()
+    finished = False
+    try:
+        while pending and len(resolved) < len(attempts):
+            now = time.monotonic()
+            if now >= deadline_at:
+                break
+
+            # Hedge once: duplicate every museum still waiting on its first attempt
+            if hedge_at and now >= hedge_at:
+                hedge_at = None
+                for name in attempts:
+                    if name not in resolved and attempts[name] == 1:
+                        try:
+                            future = _search_executor.submit(name, _run_museum_search, FEDERATED_SEARCHES[name],
+                                                             query, positions[name], count, True)
+                        except ExecutorSaturated:
+                            continue  # No spare capacity to hedge with
+                        futures[future] = name
+                        pending.add(future)
+                        attempts[name] += 1
+
+            wake_at = min(deadline_at, hedge_at) if hedge_at else deadline_at
+            done, pending = wait(pending, timeout=wake_at - now, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                name = futures[future]
+                if name in resolved:
+                    continue  # The other hedged attempt already answered
+
                 try:
-                    museum_results = future.result(timeout=15)
-                    results["paintings"].extend(museum_results.get("paintings", []))
-                    results["total"] += museum_results.get("total", 0)
+                    window, failed = future.result()
                 except Exception as e:
-                    # Log error but continue with other results
-                    museum_name = futures[future]
-                    print(f"Search failed for {museum_name}: {e}")
+                    print(f"Search failed for {name}: {e}")
+                    window, failed = None, True
+
+                if not failed:
+                    resolved.add(name)
+                    _circuit_breakers[name].record_success()
+                    yield name, window
+                    continue
+
+                attempts[name] -= 1
+                if attempts[name] == 0:
+                    resolved.add(name)
+                    _circuit_breakers[name].record_failure()
+                    skipped.append(name)
+        finished = True
+    finally:
+        # Drop queued attempts nobody is waiting for; running ones finish in the background
+        for future in pending:
+            future.cancel()
+
+        for name in attempts:
+            if name in resolved:
+                continue
+            if finished:
+                # Ran past the deadline
+                print(f"Search timed out for {name}")
+                _circuit_breakers[name].record_failure()
+                skipped.append(name)
+            else:
+                # Abandoned (e.g. the stream's client went away) - not the museum's fault
+                _circuit_breakers[name].release_probe()
 
-        return results
+    yield None, {"partial": bool(skipped), "skipped": skipped}
 
 
 def get_painting(museum, external_id):
-    """Get a single painting - checks local DB first, then API as fallback."""
+    """Get a single painting - checks local DB first, then API as fallback.
+
+    IDs the museum answered with 404 are remembered for a while, so repeat
+    lookups skip both the database and the API.
+    """
+    missing_key = f"painting:{museum}:{external_id}"
+    if negative_cache.get(missing_key):
+        return None
+
     # Try local database first (fast)
     if USE_LOCAL_DB:
         local_painting = get_painting_from_db(museum, external_id)
         if local_painting:
+            if local_painting.get("web_description"):
+                local_painting["description"] = local_painting["web_description"]
+            elif museum == "met" and not local_painting.get("web_description_fetched_at"):
+                queue_met_description(local_painting)
             return local_painting
 
     # Fallback to API
+    _request_state.not_found = False
+    painting = _get_painting_from_api(museum, external_id)
+    if painting is None and _request_state.not_found:
+        negative_cache.set(missing_key, "not_found", ttl_seconds=NEGATIVE_CACHE_NOT_FOUND_SECONDS)
+    return painting
+
+
+def get_paintings_batch(museum, external_ids, use_db=True, use_cache=True):
+    """Get many paintings from one museum at once, as {external_id: painting}.
+
+    Checks the paintings table (unless use_db is False) and both cache tiers
+    (unless use_cache is False) with one bulk query each, then fetches what's
+    left in as few upstream calls as the museum allows: AIC and Harvard take
+    up to BATCH_FETCH_SIZE IDs per request; other museums are fetched one
+    object at a time on a shared pool. IDs that aren't found are left out.
+    Fetched paintings are written back to the cache either way.
+    """
+    ids = list(dict.fromkeys(str(i) for i in external_ids if str(i)))
+    found = {}
+
+    if use_db and USE_LOCAL_DB and ids:
+        for external_id, painting in get_paintings_from_db(museum, ids).items():
+            if painting.get("web_description"):
+                painting["description"] = painting["web_description"]
+            found[external_id] = painting
+
+    missing = [i for i in ids if i not in found]
+    batch = _BATCH_DETAILS.get(museum)
+    if batch and missing:
+        if use_cache:
+            cached, known_missing = _cached_details(museum, missing)
+            found.update(cached)
+            missing = [i for i in missing if i not in found and i not in known_missing]
+
+        fetch_batch = batch[2]
+        if fetch_batch:
+            for start in range(0, len(missing), BATCH_FETCH_SIZE):
+                fetched = fetch_batch(missing[start:start + BATCH_FETCH_SIZE])
+                for external_id, painting in fetched.items():
+                    _store_detail(museum, external_id, painting)
+                    found[external_id] = copy.deepcopy(painting)
+            return found
+
+    if missing:
+        # Batch museums have had their bulk cache lookup - go straight upstream
+        found.update(_fetch_details_individually(museum, missing, use_cache and not batch))
+    return found
+
+
+def _cached_details(museum, external_ids):
+    """Bulk-read cached single-painting responses.
+
+    Returns ({external_id: painting} for fresh hits, set of IDs known to be
+    missing). Expired entries are left for the fetch to refresh.
+    """
+    request_for, cache_prefix, _ = _BATCH_DETAILS[museum]
+    found = {}
+    known_missing = set()
+    keys = {}
+    for external_id in external_ids:
+        key = _formatted_cache_key(cache_prefix, *request_for(external_id))
+        cached = memory_cache.get(key)
+        if cached:
+            found[external_id] = copy.deepcopy(cached)
+        elif negative_cache.get(key):
+            known_missing.add(external_id)
+        else:
+            keys[key] = external_id
+
+    if keys:
+        now = datetime.now(timezone.utc)
+        for key, entry in get_cached_entries(list(keys)).items():
+            data = _decompress(entry["response_data"])
+            expires_at = entry["expires_at"]
+            remaining = (expires_at - now).total_seconds() if expires_at else memory_cache.ttl_seconds
+            if not data or remaining <= 0:
+                continue
+            if data == _NOT_FOUND_MARKER:
+                known_missing.add(keys[key])
+                continue
+            memory_cache.set(key, data, ttl_seconds=min(memory_cache.ttl_seconds, remaining))
+            found[keys[key]] = copy.deepcopy(data)
+
+    return found, known_missing
+
+
+def _store_detail(museum, external_id, painting):
+    """Cache a batch-fetched painting under its single-painting key."""
+    request_for, cache_prefix, _ = _BATCH_DETAILS[museum]
+    key = _formatted_cache_key(cache_prefix, *request_for(external_id))
+    ttl_hours, _ = cache_policy(cache_prefix)
+    memory_cache.set(key, painting, ttl_seconds=min(memory_cache.ttl_seconds, ttl_hours * 3600))
+    set_cached_response(key, _compress(painting), ttl_hours=ttl_hours)
+
+
+def _fetch_details_individually(museum, external_ids, use_cache=True):
+    """Fetch paintings one by one on the shared pool (inline when it is full)."""
+    if museum == "met":
+        # Batch views don't need the scraped description
+        get = lambda object_id: met_get_painting(object_id, include_description=False)
+    else:
+        get = lambda external_id: _get_painting_from_api(museum, external_id)
+    fetch = get if use_cache else lambda external_id: _uncached(get, external_id)
+
+    futures = []
+    for external_id in external_ids:
+        try:
+            futures.append((external_id, _detail_executor.submit(None, fetch, external_id)))
+        except ExecutorSaturated:
+            futures.append((external_id, None))
+
+    found = {}
+    for external_id, future in futures:
+        painting = future.result() if future else fetch(external_id)
+        if painting:
+            found[external_id] = painting
+    return found
+
+
+def _uncached(fn, *args):
+    """Call fn with cache reads skipped on this thread (responses are still cached)."""
+    _request_state.skip_cache = True
+    try:
+        return fn(*args)
+    finally:
+        _request_state.skip_cache = False
+
+
+# Museums whose single-painting responses can be looked up in bulk:
+# museum -> (detail request builder, cache prefix, multi-ID fetcher or None)
+_BATCH_DETAILS = {
+    "aic": (_aic_detail_request, "aic_artwork", _aic_fetch_batch),
+    "harvard": (_harvard_detail_request, "harvard_artwork", _harvard_fetch_batch),
+    "met": (_met_detail_request, "met_artwork", None),
+    "cleveland": (_cleveland_detail_request, "cleveland_artwork", None),
+}
+
+# Shared pool for single-object fetches made by batch lookups
+_detail_executor = BoundedExecutor("painting-details", MET_FETCH_CONCURRENCY, MET_FETCH_CONCURRENCY * 8)
+
+
+def _get_painting_from_api(museum, external_id):
+    """Get a single painting from its museum's API."""
     if museum == "aic":
         return aic_get_painting(external_id)
     elif museum == "rijks":
@@ -1404,3 +2616,24 @@ def get_painting(museum, external_id):
     elif museum == "smithsonian":
         return smithsonian_get_painting(external_id)
     return None
+
+
+def _revalidation_stats():
+    """Get stale-while-revalidate and conditional request counters."""
+    with _revalidate_lock:
+        return dict(_revalidate_stats, pending=len(_revalidate_pending))
+
+
+def get_metrics():
+    """Get in-process cache, revalidation, request coalescing, circuit breaker and executor counters."""
+    return {
+        "memory_cache": memory_cache.stats(),
+        "negative_cache": negative_cache.stats(),
+        "single_flight": inflight.stats(),
+        "revalidation": _revalidation_stats(),
+        "circuit_breakers": {name: b.stats() for name, b in _circuit_breakers.items()},
+        "executors": {
+            "federated_search": _search_executor.stats(),
+            "painting_details": _detail_executor.stats()
+        }
+    }
@@ -0,0 +1,186 @@
+"""
+In-process response cache for Art Stuff.
+A bounded LRU with per-entry TTL that sits in front of the Supabase api_cache
+table, so repeat lookups in the same worker skip the network round trip, plus
+single-flight coalescing so concurrent misses for one key fetch upstream once,
+and the TTL policy for each kind of cached response.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+
+MEMORY_CACHE_MAX_ENTRIES = int(os.getenv("MEMORY_CACHE_MAX_ENTRIES", "2048"))
+MEMORY_CACHE_TTL_SECONDS = int(os.getenv("MEMORY_CACHE_TTL_SECONDS", "900"))
+SINGLE_FLIGHT_WAIT_SECONDS = int(os.getenv("SINGLE_FLIGHT_WAIT_SECONDS", "30"))
+
+# Shared cache TTLs by kind of response. Artwork records rarely change; search
+# results go out of date as collections change. An expired entry is still
+# served for up to CACHE_STALE_HOURS while it is refreshed in the background.
+CACHE_ARTWORK_TTL_HOURS = float(os.getenv("CACHE_ARTWORK_TTL_HOURS", "720"))
+CACHE_SEARCH_TTL_HOURS = float(os.getenv("CACHE_SEARCH_TTL_HOURS", "6"))
+CACHE_DEFAULT_TTL_HOURS = 24
+CACHE_STALE_HOURS = float(os.getenv("CACHE_STALE_HOURS", "168"))
+
+# Negative caching - how long a 404 or a failed/empty response is remembered
+# so repeats don't go upstream again
+NEGATIVE_CACHE_NOT_FOUND_SECONDS = int(os.getenv("NEGATIVE_CACHE_NOT_FOUND_SECONDS", "3600"))
+NEGATIVE_CACHE_ERROR_SECONDS = int(os.getenv("NEGATIVE_CACHE_ERROR_SECONDS", "30"))
+NEGATIVE_CACHE_MAX_ENTRIES = int(os.getenv("NEGATIVE_CACHE_MAX_ENTRIES", "4096"))
+
+
+def cache_policy(cache_prefix):
+    """Get (ttl_hours, stale_hours) for a cache prefix such as "met_artwork"."""
+    if cache_prefix.endswith("_artwork"):
+        return CACHE_ARTWORK_TTL_HOURS, CACHE_STALE_HOURS
+    if cache_prefix.endswith("_search"):
+        return CACHE_SEARCH_TTL_HOURS, CACHE_STALE_HOURS
+    return CACHE_DEFAULT_TTL_HOURS, CACHE_STALE_HOURS
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after a TTL."""
+
+    def __init__(self, max_entries=MEMORY_CACHE_MAX_ENTRIES, ttl_seconds=MEMORY_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # key -> (value, expires_at)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        """Return the cached value, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl_seconds=None):
+        """Store a value, evicting the least recently used entries if full."""
+        if self.max_entries <= 0:
+            return
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        """Remove a single entry if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Drop every entry (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Get hit/miss/eviction counters for sizing the cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+class _Call:
+    """An in-flight call that followers wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into one execution.
+
+    The first caller for a key (the leader) runs the function; callers that
+    arrive while it is running wait for and share its result. A follower that
+    waits longer than wait_seconds gives up and runs the function itself.
+    """
+
+    def __init__(self, wait_seconds=SINGLE_FLIGHT_WAIT_SECONDS):
+        self.wait_seconds = wait_seconds
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.followers = 0
+        self.follower_timeouts = 0
+
+    def do(self, key, fn):
+        """Run fn() once per key across concurrent callers and return its result."""
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = _Call()
+                self._calls[key] = call
+                self.leaders += 1
+            else:
+                self.followers += 1
+
+        if not is_leader:
+            if call.done.wait(self.wait_seconds):
+                if call.error is not None:
+                    raise call.error
+                return call.result
+            with self._lock:
+                self.follower_timeouts += 1
+            return fn()
+
+        try:
+            call.result = fn()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def stats(self):
+        """Get leader/follower counters (followers are upstream calls saved)."""
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "leaders": self.leaders,
+                "followers": self.followers,
+                "follower_timeouts": self.follower_timeouts
+            }
+
+
+# Shared per-process cache for upstream museum API responses
+memory_cache = TTLCache()
+
+# Shared per-process record of upstream misses (value is the reason, e.g. "not_found")
+negative_cache = TTLCache(max_entries=NEGATIVE_CACHE_MAX_ENTRIES, ttl_seconds=NEGATIVE_CACHE_ERROR_SECONDS)
+
+# Shared per-process coalescing of identical upstream fetches
+inflight = SingleFlight()
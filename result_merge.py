@@ -0,0 +1,120 @@
+"""
+Merging federated search results for Art Stuff.
+Scores each museum's results against the query, interleaves museums fairly
+(one result per museum per round, best first within a round), drops the same
+painting coming from two sources, and encodes where each museum's result list
+was left off as an opaque cursor for the next page.
+"""
+import re
+import json
+import base64
+import binascii
+
+from search_index import tokenize
+
+_NORMALIZE_RE = re.compile(r"[^\w]+")
+
+# Placeholder artist names museums use when the maker isn't known
+UNKNOWN_ARTISTS = {"anonymous", "unknown", "artist unknown", "unknown artist"}
+
+
+def score_painting(painting, query, query_tokens, rank):
+    """Score how well a painting matches the query (higher is better).
+
+    Query words in the title count most, then the artist, then the
+    description; the whole query as a phrase earns a bonus. The museum's own
+    ranking (rank 0 = its top hit) breaks ties.
+    """
+    title = (painting.get("title") or "").lower()
+    artist = (painting.get("artist") or "").lower()
+    description = (painting.get("description") or "").lower()
+    title_tokens = set(tokenize(title))
+    artist_tokens = set(tokenize(artist))
+
+    score = 0.0
+    for token in query_tokens:
+        if token in title_tokens:
+            score += 3
+        elif token in artist_tokens:
+            score += 2
+        elif token in description:
+            score += 1
+
+    if query and (query in title or query in artist):
+        score += 2
+
+    return score + 1 / (1 + rank)
+
+
+def dedupe_key(painting):
+    """Get a key identifying the same painting across museums (title + artist)."""
+    title = _NORMALIZE_RE.sub(" ", (painting.get("title") or "").lower()).strip()
+    artist = _NORMALIZE_RE.sub(" ", (painting.get("artist") or "").lower()).strip()
+    if not title or title == "untitled" or not artist or artist in UNKNOWN_ARTISTS:
+        # Too generic to match on ("Portrait of a Man" by an unknown artist
+        # in two museums is two paintings) - only exact records are duplicates
+        return (painting.get("museum"), painting.get("external_id"))
+    return (title, artist)
+
+
+def merge_ranked(windows, query, limit):
+    """Interleave museum result windows into one ranked, deduplicated page.
+
+    windows maps museum -> list of (rank, painting) in the museum's own order.
+    Each round takes the next result from every museum that has one and
+    orders them by score; rounds repeat until the page is full. Returns
+    (paintings, consumed) where consumed maps museum -> how many of its
+    window's results were used (taken or dropped as duplicates), so the next
+    page can resume right after them.
+    """
+    query = query.lower().strip()
+    query_tokens = tokenize(query)
+    heads = {museum: 0 for museum in windows}
+    seen = set()
+    merged = []
+
+    while len(merged) < limit:
+        candidates = []
+        for museum in sorted(windows):
+            window = windows[museum]
+            # Duplicates of something already on the page are skipped for good
+            while heads[museum] < len(window) and dedupe_key(window[heads[museum]][1]) in seen:
+                heads[museum] += 1
+            if heads[museum] < len(window):
+                rank, painting = window[heads[museum]]
+                candidates.append((-score_painting(painting, query, query_tokens, rank), museum, painting))
+
+        if not candidates:
+            break
+
+        candidates.sort(key=lambda c: (c[0], c[1]))
+        for _, museum, painting in candidates:
+            if len(merged) >= limit:
+                break
+            key = dedupe_key(painting)
+            heads[museum] += 1
+            if key in seen:
+                continue  # Same painting from another museum earlier this round
+            seen.add(key)
+            merged.append(painting)
+
+    return merged, heads
+
+
+def encode_cursor(query, positions):
+    """Encode each museum's position for the next page as an opaque string."""
+    payload = json.dumps({"q": query.lower().strip(), "p": positions}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor, query):
+    """Decode a cursor from encode_cursor, or None if invalid or for another query."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, binascii.Error, UnicodeError):
+        return None
+    if not isinstance(payload, dict) or payload.get("q") != query.lower().strip():
+        return None
+    positions = payload.get("p")
+    return positions if isinstance(positions, dict) else None
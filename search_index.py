@@ -0,0 +1,184 @@
+"""
+In-memory search indexes for Art Stuff.
+TextIndex answers case-insensitive substring queries over a fixed list of
+records (e.g. the Rijksmuseum catalogue) without scanning every record per
+query. FuzzyIndex finds vocabulary terms within a small edit distance of a
+query (spelling suggestions) without comparing against every term.
+"""
+import re
+from collections import defaultdict
+
+_TOKEN_RE = re.compile(r"\w+")
+GRAM_SIZE = 3
+
+
+def tokenize(text):
+    """Split lowercased text into word tokens."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _grams(token):
+    """Get the character n-grams of a token."""
+    return {token[i:i + GRAM_SIZE] for i in range(len(token) - GRAM_SIZE + 1)}
+
+
+class TextIndex:
+    """Inverted token index with substring/prefix matching.
+
+    Every word of a query has to occur inside some indexed token, so the
+    postings of matching tokens narrow the candidates; an n-gram index over
+    the token vocabulary finds those tokens without scanning it. Candidates
+    are then checked against the lowercased fields (computed once at build
+    time), which keeps results identical to a plain substring scan.
+    """
+
+    def __init__(self, records, fields):
+        self.records = records
+        self._fields = [tuple((r.get(f) or "").lower() for f in fields) for r in records]
+        self._postings = defaultdict(set)  # token -> record positions
+        self._gram_tokens = defaultdict(set)  # n-gram -> tokens containing it
+
+        for pos, values in enumerate(self._fields):
+            for value in values:
+                for token in _TOKEN_RE.findall(value):
+                    self._postings[token].add(pos)
+
+        for token in self._postings:
+            for gram in _grams(token):
+                self._gram_tokens[gram].add(token)
+
+    def _tokens_containing(self, fragment):
+        """Get every indexed token that contains the fragment."""
+        if len(fragment) < GRAM_SIZE:
+            return [t for t in self._postings if fragment in t]
+
+        grams = sorted(_grams(fragment), key=lambda g: len(self._gram_tokens.get(g, ())))
+        candidates = set(self._gram_tokens.get(grams[0], ()))
+        for gram in grams[1:]:
+            if not candidates:
+                break
+            candidates &= self._gram_tokens.get(gram, set())
+        return [t for t in candidates if fragment in t]
+
+    def search(self, query):
+        """Get records with the query as a substring of any field, in index order."""
+        query = query.lower()
+        words = _TOKEN_RE.findall(query)
+
+        if words:
+            positions = None
+            # Rarest-looking (longest) words first narrows fastest
+            for word in sorted(set(words), key=len, reverse=True):
+                matched = set()
+                for token in self._tokens_containing(word):
+                    matched |= self._postings[token]
+                positions = matched if positions is None else positions & matched
+                if not positions:
+                    return []
+            candidates = sorted(positions)
+        else:
+            candidates = range(len(self.records))  # Punctuation-only query
+
+        return [
+            self.records[pos] for pos in candidates
+            if any(query in value for value in self._fields[pos])
+        ]
+
+
+def levenshtein(s1, s2, max_distance=None):
+    """Levenshtein distance between two strings.
+
+    With max_distance, stops early and returns max_distance + 1 once the
+    distance is known to exceed it.
+    """
+    if len(s1) < len(s2):
+        s1, s2 = s2, s1
+    if max_distance is not None and len(s1) - len(s2) > max_distance:
+        return max_distance + 1
+    if len(s2) == 0:
+        return len(s1)
+
+    prev_row = range(len(s2) + 1)
+    for i, c1 in enumerate(s1):
+        curr_row = [i + 1]
+        for j, c2 in enumerate(s2):
+            insertions = prev_row[j + 1] + 1
+            deletions = curr_row[j] + 1
+            substitutions = prev_row[j] + (c1 != c2)
+            curr_row.append(min(insertions, deletions, substitutions))
+        if max_distance is not None and min(curr_row) > max_distance:
+            return max_distance + 1
+        prev_row = curr_row
+
+    return prev_row[-1]
+
+
+def _deletes(word, max_distance):
+    """Get every string made by deleting up to max_distance characters (including word)."""
+    results = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))} - results
+        results |= frontier
+    return results
+
+
+class FuzzyIndex:
+    """SymSpell-style deletion index for fuzzy term lookup.
+
+    Each term is indexed under every variant of its prefix with up to
+    max_distance characters deleted. A lookup generates the same variants of
+    the query, so only terms sharing a variant are compared with the real
+    edit distance. Each term carries a value (the suggestion to show) and a
+    count used to rank equally close matches.
+    """
+
+    def __init__(self, max_distance=2, prefix_length=7):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self._terms = []
+        self._values = []
+        self._counts = []
+        self._term_ids = {}
+        self._variants = defaultdict(list)  # deleted prefix -> term ids
+
+    def __len__(self):
+        return len(self._terms)
+
+    def __contains__(self, term):
+        return term.lower() in self._term_ids
+
+    def add(self, term, value, count=1):
+        """Add a term (the first value registered for a term is kept)."""
+        term = term.lower()
+        term_id = self._term_ids.get(term)
+        if term_id is not None:
+            self._counts[term_id] += count
+            return
+
+        term_id = len(self._terms)
+        self._term_ids[term] = term_id
+        self._terms.append(term)
+        self._values.append(value)
+        self._counts.append(count)
+        for variant in _deletes(term[:self.prefix_length], self.max_distance):
+            self._variants[variant].append(term_id)
+
+    def lookup(self, query, max_distance=None):
+        """Get (term, value, distance) matches, closest and most common first."""
+        query = query.lower()
+        max_distance = self.max_distance if max_distance is None else min(max_distance, self.max_distance)
+
+        seen = set()
+        matches = []
+        for variant in _deletes(query[:self.prefix_length], max_distance):
+            for term_id in self._variants.get(variant, ()):
+                if term_id in seen:
+                    continue
+                seen.add(term_id)
+                distance = levenshtein(query, self._terms[term_id], max_distance)
+                if distance <= max_distance:
+                    matches.append((distance, -self._counts[term_id], term_id))
+
+        matches.sort()
+        return [(self._terms[t], self._values[t], distance) for distance, _, t in matches]
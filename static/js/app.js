@@ -812,6 +812,8 @@ function createPaintingCard(painting) {
         <div class="painting-card__image-container">
             <img class="painting-card__image"
                  src="${painting.thumbnail_url || painting.image_url}"
+                 srcset="${painting.srcset || ''}"
+                 sizes="(max-width: 600px) 50vw, 300px"
                  alt="${painting.title}"
                  loading="lazy">
         </div>
@@ -1043,7 +1045,7 @@ async function initCollection() {
         try {
             // Fetch both favorites count and user's playlists
             const [favoritesData, collectionsData] = await Promise.all([
-                API.getFavorites(),
+                API.getFavorites({ limit: 4 }),
                 API.getCollections()
             ]);
             console.log('API data:', { favoritesData, collectionsData });
@@ -1059,7 +1061,7 @@ async function initCollection() {
             html += createPlaylistCard({
                 id: 'saved',
                 name: 'Saved',
-                count: favorites.length,
+                count: favoritesData.total ?? favorites.length,
                 coverImages: savedCoverImages,
                 isSaved: true,
                 isShareable: false
@@ -1237,6 +1239,8 @@ async function initCollection() {
             <div class="painting-card__image-container">
                 <img class="painting-card__image"
                      src="${painting.thumbnail_url || painting.image_url}"
+                     srcset="${painting.srcset || ''}"
+                     sizes="(max-width: 600px) 50vw, 300px"
                      alt="${painting.title}"
                      loading="lazy">
             </div>
@@ -1313,6 +1317,9 @@ async function initCollection() {
             <div id="saved-paintings-grid" class="painting-grid">
                 <div class="loading">Loading saved paintings</div>
             </div>
+            <div class="load-more" id="saved-load-more" style="display: none;">
+                <button class="btn" id="saved-load-more-btn">Load More</button>
+            </div>
         `;
 
         document.getElementById('back-to-playlists').addEventListener('click', () => {
@@ -1320,16 +1327,34 @@ async function initCollection() {
             loadPlaylists();
         });
 
-        try {
-            const data = await API.getFavorites();
-            console.log('[Art Stuff] Favorites data:', data);
-            const grid = document.getElementById('saved-paintings-grid');
-            console.log('[Art Stuff] Saved paintings grid:', grid);
+        const grid = document.getElementById('saved-paintings-grid');
+        const loadMore = document.getElementById('saved-load-more');
+        let nextCursor = null;
+        let loading = false;
 
-            if (data.favorites && data.favorites.length > 0) {
-                grid.innerHTML = '';
-                console.log('[Art Stuff] Rendering', data.favorites.length, 'favorites');
-                data.favorites.forEach((painting, index) => {
+        // Favorites come a page at a time; Load More fetches the next one
+        async function loadSavedPage(append) {
+            if (loading) return;
+            loading = true;
+            try {
+                const params = { limit: 48 };
+                if (append && nextCursor) params.cursor = nextCursor;
+                const data = await API.getFavorites(params);
+                nextCursor = data.next_cursor || null;
+                renderSavedPaintings(data.favorites || [], append);
+                loadMore.style.display = nextCursor ? 'block' : 'none';
+            } catch (e) {
+                console.error('Failed to load saved paintings:', e);
+            } finally {
+                loading = false;
+            }
+        }
+
+        function renderSavedPaintings(favorites, append) {
+            if (favorites.length > 0) {
+                if (!append) grid.innerHTML = '';
+                console.log('[Art Stuff] Rendering', favorites.length, 'favorites');
+                favorites.forEach((painting, index) => {
                     console.log('[Art Stuff] Creating card for:', painting.title, painting);
                     const card = createPaintingCardWithMenu(painting, {
                         showRemove: true,
@@ -1355,7 +1380,7 @@ async function initCollection() {
                     });
                     grid.appendChild(card);
                 });
-            } else {
+            } else if (!append) {
                 grid.innerHTML = `
                     <div class="empty-state" style="grid-column: 1 / -1;">
                         <p>No saved paintings yet</p>
@@ -1363,9 +1388,10 @@ async function initCollection() {
                     </div>
                 `;
             }
-        } catch (e) {
-            console.error('Failed to load saved paintings:', e);
         }
+
+        document.getElementById('saved-load-more-btn').addEventListener('click', () => loadSavedPage(true));
+        await loadSavedPage(false);
     }
 
     async function showCollectionPaintings(collectionId, collectionName, slug) {
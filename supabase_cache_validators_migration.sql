@@ -0,0 +1,9 @@
+-- API cache validators migration
+-- Run this in the Supabase SQL Editor
+--
+-- Stores the upstream ETag / Last-Modified with each cached response so an
+-- expired entry can be revalidated with a conditional request; a 304 just
+-- extends the entry instead of downloading the record again.
+
+ALTER TABLE api_cache ADD COLUMN IF NOT EXISTS etag TEXT;
+ALTER TABLE api_cache ADD COLUMN IF NOT EXISTS last_modified TEXT;
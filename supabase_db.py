@@ -3,11 +3,23 @@ Database module for Art Stuff - Supabase version.
 Handles cloud storage for paintings, favorites, tags, and journal entries.
 """
 import os
+import re
 import json
-from datetime import datetime, timedelta
-from supabase import create_client, Client
+import base64
+import binascii
+import threading
+import contextvars
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import httpx
+from supabase import create_client, Client, ClientOptions
+from postgrest import SyncPostgrestClient
+from postgrest.utils import SyncClient
 from dotenv import load_dotenv
 
+from response_cache import CACHE_STALE_HOURS
+
 load_dotenv()
 
 # Initialize Supabase client
@@ -15,27 +27,128 @@ SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_ANON_KEY")
 SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
 
-supabase: Client = None
-supabase_admin: Client = None
+# PostgREST connection pool shared by every client in this process
+SUPABASE_POOL_CONNECTIONS = int(os.getenv("SUPABASE_POOL_CONNECTIONS", "50"))
+SUPABASE_POOL_KEEPALIVE_SECONDS = float(os.getenv("SUPABASE_POOL_KEEPALIVE_SECONDS", "60"))
+SUPABASE_TIMEOUT_SECONDS = float(os.getenv("SUPABASE_TIMEOUT_SECONDS", "30"))
+
+_transport = httpx.HTTPTransport(
+    http2=True,
+    limits=httpx.Limits(
+        max_connections=SUPABASE_POOL_CONNECTIONS,
+        max_keepalive_connections=SUPABASE_POOL_CONNECTIONS,
+        keepalive_expiry=SUPABASE_POOL_KEEPALIVE_SECONDS
+    )
+)
+
+_clients = {}  # "anon" / "service" -> shared Client
+_clients_lock = threading.Lock()
+
+# The signed-in user's PostgREST client for the current request, if any
+_request_client = contextvars.ContextVar("supabase_request_client", default=None)
+
+
+class _PooledPostgrestClient(SyncPostgrestClient):
+    """PostgREST client whose HTTP session uses the shared connection pool."""
+
+    def create_session(self, base_url, headers, timeout, verify=True, proxy=None):
+        return SyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=timeout,
+            transport=_transport,
+            follow_redirects=True
+        )
+
+
+class _PooledClient(Client):
+    """Supabase client whose PostgREST requests use the shared connection pool."""
+
+    @staticmethod
+    def _init_postgrest_client(rest_url, headers, schema, timeout=SUPABASE_TIMEOUT_SECONDS, verify=True, proxy=None):
+        return _PooledPostgrestClient(rest_url, headers=headers, schema=schema, timeout=timeout)
+
+
+class _UserClient:
+    """PostgREST access as one signed-in user, so row level security applies.
+
+    Cheap to create - it shares the process-wide connection pool.
+    """
+
+    def __init__(self, access_token):
+        self.postgrest = _PooledPostgrestClient(
+            f"{SUPABASE_URL}/rest/v1",
+            headers={"apiKey": SUPABASE_KEY, "Authorization": f"Bearer {access_token}"},
+            timeout=SUPABASE_TIMEOUT_SECONDS
+        )
+
+    def table(self, table_name):
+        return self.postgrest.from_(table_name)
+
+    def rpc(self, fn, params=None, **kwargs):
+        return self.postgrest.rpc(fn, params or {}, **kwargs)
+
+
+def _stateless_options():
+    """Client options that never keep or refresh a signed-in session."""
+    return ClientOptions(
+        auto_refresh_token=False,
+        persist_session=False,
+        postgrest_client_timeout=SUPABASE_TIMEOUT_SECONDS
+    )
 
-def get_client() -> Client:
-    """Get or create Supabase client."""
-    global supabase
-    if supabase is None:
-        if not SUPABASE_URL or not SUPABASE_KEY:
-            raise ValueError("SUPABASE_URL and SUPABASE_ANON_KEY must be set in .env")
-        supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
-    return supabase
+
+def _shared_client(role):
+    """Get or create the process-wide anon or service client.
+
+    These clients never sign in, so they hold no per-user session and are
+    safe to share between threads.
+    """
+    client = _clients.get(role)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(role)
+            if client is None:
+                if role == "service":
+                    if not SUPABASE_URL or not SUPABASE_SERVICE_KEY:
+                        raise ValueError("SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY must be set")
+                    key = SUPABASE_SERVICE_KEY
+                else:
+                    if not SUPABASE_URL or not SUPABASE_KEY:
+                        raise ValueError("SUPABASE_URL and SUPABASE_ANON_KEY must be set in .env")
+                    key = SUPABASE_KEY
+                client = _PooledClient.create(SUPABASE_URL, key, _stateless_options())
+                _clients[role] = client
+    return client
+
+
+def set_request_user(access_token):
+    """Run this request's queries as the user with this (verified) access token.
+
+    Pass None to go back to anonymous access, e.g. when the request ends.
+    """
+    _request_client.set(_UserClient(access_token) if access_token else None)
+
+
+def get_client():
+    """Get a Supabase client for table queries.
+
+    Inside a request with a signed-in user (set_request_user) queries run as
+    that user; otherwise they use the shared anon client.
+    """
+    return _request_client.get() or _shared_client("anon")
 
 
 def get_admin_client() -> Client:
-    """Get or create Supabase admin client (uses service role key)."""
-    global supabase_admin
-    if supabase_admin is None:
-        if not SUPABASE_URL or not SUPABASE_SERVICE_KEY:
-            raise ValueError("SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY must be set")
-        supabase_admin = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
-    return supabase_admin
+    """Get the shared Supabase admin client (uses service role key)."""
+    return _shared_client("service")
+
+
+def _auth_client() -> Client:
+    """Create a throwaway client for sign up/in, whose session is never shared."""
+    if not SUPABASE_URL or not SUPABASE_KEY:
+        raise ValueError("SUPABASE_URL and SUPABASE_ANON_KEY must be set in .env")
+    return create_client(SUPABASE_URL, SUPABASE_KEY, _stateless_options())
 
 
 def init_db():
@@ -58,7 +171,7 @@ def init_db():
 
 def sign_up(email, password):
     """Create a new user account."""
-    client = get_client()
+    client = _auth_client()
     try:
         result = client.auth.sign_up({
             "email": email,
@@ -83,7 +196,7 @@ def sign_up(email, password):
 
 def sign_in(email, password):
     """Sign in an existing user."""
-    client = get_client()
+    client = _auth_client()
     try:
         result = client.auth.sign_in_with_password({
             "email": email,
@@ -107,10 +220,12 @@ def sign_in(email, password):
 
 
 def sign_out(access_token):
-    """Sign out a user."""
-    client = get_client()
+    """Sign out a user (revokes their refresh tokens)."""
+    if not access_token:
+        return {"success": True}
+    client = _shared_client("anon")
     try:
-        client.auth.sign_out()
+        client.auth.admin.sign_out(access_token)
         return {"success": True}
     except Exception as e:
         print(f"Sign out error: {e}")
@@ -119,7 +234,7 @@ def sign_out(access_token):
 
 def get_user_from_token(access_token):
     """Get user info from an access token."""
-    client = get_client()
+    client = _shared_client("anon")
     try:
         result = client.auth.get_user(access_token)
         if result.user:
@@ -134,7 +249,7 @@ def get_user_from_token(access_token):
 
 def reset_password_request(email):
     """Send a password reset email to the user."""
-    client = get_client()
+    client = _auth_client()
     try:
         client.auth.reset_password_for_email(email)
         return {"success": True}
@@ -164,6 +279,24 @@ def delete_user_account(user_id):
 # FAVORITES FUNCTIONS
 # ============================================
 
+# Favorite columns plus tag names embedded through favorite_tags, so tags
+# come back in the same query instead of one query per favorite
+FAVORITE_WITH_TAGS = "*, tags(name)"
+
+
+# Columns the collection grid needs - long text fields are left to the detail view
+FAVORITE_LIST_COLUMNS = (
+    "id, external_id, museum, museum_name, title, artist, date_display, "
+    "image_url, thumbnail_url, created_at, tags(name)"
+)
+
+
+def _with_tag_names(fav):
+    """Flatten an embedded tags list ([{"name": ...}]) to tag names."""
+    fav["tags"] = [tag["name"] for tag in fav.get("tags") or [] if tag.get("name")]
+    return fav
+
+
 def add_favorite(painting_data, user_id):
     """Add a painting to favorites."""
     client = get_client()
@@ -221,13 +354,12 @@ def get_favorite(favorite_id, user_id):
     client = get_client()
     try:
         result = (client.table("favorites")
-                  .select("*")
+                  .select(FAVORITE_WITH_TAGS)
                   .eq("id", favorite_id)
                   .eq("user_id", user_id)
                   .execute())
         if result.data:
-            fav = result.data[0]
-            fav["tags"] = get_tags_for_favorite(favorite_id, user_id)
+            fav = _with_tag_names(result.data[0])
             fav["journal_entries"] = get_journal_entries(favorite_id, user_id)
             return fav
     except Exception as e:
@@ -240,50 +372,106 @@ def get_favorite_by_external_id(external_id, museum, user_id):
     client = get_client()
     try:
         result = (client.table("favorites")
-                  .select("*")
+                  .select(FAVORITE_WITH_TAGS)
                   .eq("external_id", external_id)
                   .eq("museum", museum)
                   .eq("user_id", user_id)
                   .execute())
         if result.data:
-            fav = result.data[0]
-            fav["tags"] = get_tags_for_favorite(fav["id"], user_id)
-            return fav
+            return _with_tag_names(result.data[0])
     except Exception as e:
         print(f"Error getting favorite by external_id: {e}")
     return None
 
 
-def get_all_favorites(user_id, filters=None):
-    """Get all favorites with optional filters."""
+def _filtered_favorites(client, user_id, columns, filters, count=None):
+    """Start a favorites query for a user with the artist/museum/tag filters applied."""
+    if filters.get("tag"):
+        # Inner join on a second embed of tags filters favorites to those
+        # with the tag, while tags(name) still lists all of their tags
+        columns += ", tag_filter:tags!inner(name)"
+    query = client.table("favorites").select(columns, count=count).eq("user_id", user_id)
+
+    if filters.get("artist"):
+        query = query.ilike("artist", f"%{filters['artist']}%")
+    if filters.get("museum"):
+        query = query.eq("museum", filters["museum"])
+    if filters.get("tag"):
+        query = query.eq("tag_filter.name", filters["tag"])
+    return query
+
+
+def _favorite_rows(rows):
+    """Drop the tag filter embed and flatten tag names for favorites rows."""
+    favorites = []
+    for fav in rows:
+        fav.pop("tag_filter", None)
+        favorites.append(_with_tag_names(fav))
+    return favorites
+
+
+def get_favorites_page(user_id, filters=None, limit=50, cursor=None):
+    """Get one page of favorites, newest first, with optional filters.
+
+    Pages are keyed on (created_at, id) rather than offsets, so each page
+    costs the same however deep it is. Returns {"favorites", "next_cursor"},
+    plus "total" on the first page. Raises ValueError for a bad cursor.
+    """
     client = get_client()
+    filters = filters or {}
+    after = decode_favorites_cursor(cursor) if cursor else None
     try:
-        query = client.table("favorites").select("*").eq("user_id", user_id)
+        select = _filtered_favorites(client, user_id, FAVORITE_LIST_COLUMNS, filters,
+                                     count="exact" if after is None else None)
+        if after:
+            created_at, favorite_id = after
+            select = select.or_(
+                f'created_at.lt."{created_at}",'
+                f'and(created_at.eq."{created_at}",id.lt.{favorite_id})'
+            )
 
-        if filters:
-            if filters.get("artist"):
-                query = query.ilike("artist", f"%{filters['artist']}%")
-            if filters.get("museum"):
-                query = query.eq("museum", filters["museum"])
+        # One extra row tells us whether there's another page
+        result = (select.order("created_at", desc=True)
+                  .order("id", desc=True)
+                  .limit(limit + 1)
+                  .execute())
 
-        query = query.order("created_at", desc=True)
-        result = query.execute()
+        rows = result.data or []
+        favorites = _favorite_rows(rows[:limit])
 
-        favorites = []
-        for fav in result.data or []:
-            fav["tags"] = get_tags_for_favorite(fav["id"], user_id)
+        page = {
+            "favorites": favorites,
+            "next_cursor": encode_favorites_cursor(favorites[-1]) if len(rows) > limit else None
+        }
+        if after is None:
+            page["total"] = result.count if result.count is not None else len(favorites)
+        return page
+    except Exception as e:
+        print(f"Error getting favorites page: {e}")
+        return {"favorites": [], "next_cursor": None}
 
-            # Filter by tag if specified
-            if filters and filters.get("tag"):
-                if filters["tag"] not in fav["tags"]:
-                    continue
 
-            favorites.append(fav)
+_TIMESTAMP_RE = re.compile(r"^\d{4}-\d{2}-\d{2}[T ][\d:.]+(?:Z|[+-]\d{2}:?\d{2})?$")
 
-        return favorites
-    except Exception as e:
-        print(f"Error getting favorites: {e}")
-        return []
+
+def encode_favorites_cursor(fav):
+    """Encode the position after a favorite as an opaque cursor."""
+    payload = json.dumps([fav["created_at"], fav["id"]], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_favorites_cursor(cursor):
+    """Decode a cursor into (created_at, id), raising ValueError if invalid."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, favorite_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        # Both go into a PostgREST filter - accept only a timestamp and a UUID
+        if not _TIMESTAMP_RE.match(created_at):
+            raise ValueError(created_at)
+        favorite_id = str(uuid.UUID(favorite_id))
+    except (ValueError, TypeError, binascii.Error, UnicodeError) as e:
+        raise ValueError("Invalid cursor") from e
+    return created_at, favorite_id
 
 
 def get_random_favorite(user_id):
@@ -406,17 +594,16 @@ def get_all_tags(user_id):
     """Get all tags with counts for a user."""
     client = get_client()
     try:
-        # Get all tags for this user
-        result = client.table("tags").select("id, name").eq("user_id", user_id).execute()
+        # Each tag with its favorite count, counted by PostgREST in one query
+        result = (client.table("tags")
+                  .select("name, favorite_tags(count)")
+                  .eq("user_id", user_id)
+                  .execute())
 
         tags_with_counts = []
         for tag in result.data or []:
-            # Count favorites for this tag
-            count_result = (client.table("favorite_tags")
-                          .select("favorite_id", count="exact")
-                          .eq("tag_id", tag["id"])
-                          .execute())
-            count = count_result.count if count_result.count else 0
+            counts = tag.get("favorite_tags") or [{}]
+            count = counts[0].get("count") or 0
             if count > 0:
                 tags_with_counts.append({"name": tag["name"], "count": count})
 
@@ -516,55 +703,115 @@ def get_public_journal_entries(favorite_id):
 # CACHE FUNCTIONS
 # ============================================
 
-def get_cached_response(cache_key):
-    """Get a cached API response."""
+def get_cached_entry(cache_key):
+    """Get a cached API response with its expiry, even if expired.
+
+    Returns {"response_data", "expires_at", "etag", "last_modified"} or None.
+    Expired rows are kept so they can be served stale or revalidated while a
+    refresh runs; clear_old_cache removes them.
+    """
     client = get_client()
     try:
+        # select("*") so this still works before the validators migration
         result = (client.table("api_cache")
-                  .select("response_data, expires_at")
+                  .select("*")
                   .eq("cache_key", cache_key)
                   .execute())
 
         if result.data:
             cache_entry = result.data[0]
-            # Check if expired
-            expires_at = datetime.fromisoformat(cache_entry["expires_at"].replace("Z", "+00:00"))
-            if expires_at > datetime.now(expires_at.tzinfo):
-                return cache_entry["response_data"]
-            else:
-                # Clean up expired entry
-                client.table("api_cache").delete().eq("cache_key", cache_key).execute()
+            return {
+                "response_data": cache_entry["response_data"],
+                "expires_at": datetime.fromisoformat(cache_entry["expires_at"].replace("Z", "+00:00")),
+                "etag": cache_entry.get("etag"),
+                "last_modified": cache_entry.get("last_modified")
+            }
     except Exception as e:
         print(f"Error getting cached response: {e}")
     return None
 
 
-def set_cached_response(cache_key, response_data, ttl_hours=24):
-    """Cache an API response."""
+def get_cached_entries(cache_keys):
+    """Get many cached API responses at once, as {cache_key: entry} (see get_cached_entry)."""
     client = get_client()
+    entries = {}
     try:
-        expires_at = (datetime.utcnow() + timedelta(hours=ttl_hours)).isoformat()
+        for start in range(0, len(cache_keys), 100):
+            result = (client.table("api_cache")
+                      .select("*")
+                      .in_("cache_key", cache_keys[start:start + 100])
+                      .execute())
+            for cache_entry in result.data or []:
+                entries[cache_entry["cache_key"]] = {
+                    "response_data": cache_entry["response_data"],
+                    "expires_at": datetime.fromisoformat(cache_entry["expires_at"].replace("Z", "+00:00")),
+                    "etag": cache_entry.get("etag"),
+                    "last_modified": cache_entry.get("last_modified")
+                }
+    except Exception as e:
+        print(f"Error getting cached responses: {e}")
+    return entries
 
-        # Upsert (insert or update)
-        client.table("api_cache").upsert({
+
+# Cleared when api_cache turns out not to have the validator columns
+_cache_validators_supported = True
+
+
+def set_cached_response(cache_key, response_data, ttl_hours=24, etag=None, last_modified=None):
+    """Cache an API response, with its upstream validators if any."""
+    global _cache_validators_supported
+    client = get_client()
+    try:
+        expires_at = (datetime.now(timezone.utc) + timedelta(hours=ttl_hours)).isoformat()
+        row = {
             "cache_key": cache_key,
             "response_data": response_data,
             "expires_at": expires_at
-        }).execute()
+        }
+        # Validator columns come from supabase_cache_validators_migration.sql
+        if (etag or last_modified) and _cache_validators_supported:
+            try:
+                client.table("api_cache").upsert(
+                    {**row, "etag": etag, "last_modified": last_modified}
+                ).execute()
+                return
+            except Exception as e:
+                print(f"Error setting cache validators, storing the response without them: {e}")
+                if "etag" in str(e) or "last_modified" in str(e):
+                    # Not migrated yet - stop sending the columns
+                    _cache_validators_supported = False
+
+        # Upsert (insert or update)
+        client.table("api_cache").upsert(row).execute()
     except Exception as e:
         print(f"Error setting cache: {e}")
 
 
-def clear_old_cache(days=7):
-    """Clear cache entries older than specified days."""
+def extend_cached_response(cache_key, ttl_hours=24):
+    """Push back a cached response's expiry (after upstream said it's unchanged)."""
     client = get_client()
     try:
-        cutoff = (datetime.utcnow() - timedelta(days=days)).isoformat()
+        expires_at = (datetime.now(timezone.utc) + timedelta(hours=ttl_hours)).isoformat()
+        client.table("api_cache").update({"expires_at": expires_at}).eq("cache_key", cache_key).execute()
+    except Exception as e:
+        print(f"Error extending cache: {e}")
+
+
+def clear_old_cache(stale_hours=CACHE_STALE_HOURS):
+    """Delete cache entries that expired more than stale_hours ago.
+
+    Entries are still served (and revalidated) for stale_hours after they
+    expire, so only rows past that window are dead.
+    """
+    client = get_client()
+    try:
+        cutoff = (datetime.now(timezone.utc) - timedelta(hours=stale_hours)).isoformat()
+        # Count the deleted rows rather than sending them all back
         result = (client.table("api_cache")
-                  .delete()
-                  .lt("created_at", cutoff)
+                  .delete(count="exact", returning="minimal")
+                  .lt("expires_at", cutoff)
                   .execute())
-        return len(result.data) if result.data else 0
+        return result.count or 0
     except Exception as e:
         print(f"Error clearing cache: {e}")
         return 0
@@ -665,6 +912,27 @@ def search_paintings(query, museum=None, page=1, limit=20):
         return {"paintings": [], "total": 0, "page": page}
 
 
+def get_painting_names():
+    """Get the artist and title of every painting (for the spelling index)."""
+    client = get_client()
+    rows = []
+    try:
+        # Paginate past the Supabase default limit of 1000
+        offset = 0
+        page_size = 1000
+        while True:
+            result = client.table("paintings").select("artist, title").range(offset, offset + page_size - 1).execute()
+            if not result.data:
+                break
+            rows.extend(result.data)
+            if len(result.data) < page_size:
+                break
+            offset += page_size
+    except Exception as e:
+        print(f"Error getting painting names: {e}")
+    return rows
+
+
 def get_painting_from_db(museum, external_id):
     """Get a painting from the local database."""
     client = get_client()
@@ -680,6 +948,84 @@ def get_painting_from_db(museum, external_id):
         return None
 
 
+def get_paintings_from_db(museum, external_ids):
+    """Get many paintings from one museum, as {external_id: painting}."""
+    client = get_client()
+    paintings = {}
+    try:
+        # Chunk the IN list to keep the request URL short
+        for start in range(0, len(external_ids), 100):
+            result = (client.table("paintings")
+                      .select("*")
+                      .eq("museum", museum)
+                      .in_("external_id", external_ids[start:start + 100])
+                      .execute())
+            for row in result.data or []:
+                paintings[str(row["external_id"])] = row
+    except Exception as e:
+        print(f"Error getting paintings: {e}")
+    return paintings
+
+
+def get_painting_external_ids(museum):
+    """Get the external IDs of every stored painting from one museum."""
+    client = get_client()
+    external_ids = []
+    try:
+        # Paginate past the Supabase default limit of 1000
+        offset = 0
+        page_size = 1000
+        while True:
+            result = (client.table("paintings")
+                      .select("external_id")
+                      .eq("museum", museum)
+                      .range(offset, offset + page_size - 1)
+                      .execute())
+            if not result.data:
+                break
+            external_ids.extend(row["external_id"] for row in result.data)
+            if len(result.data) < page_size:
+                break
+            offset += page_size
+    except Exception as e:
+        print(f"Error getting painting IDs: {e}")
+    return external_ids
+
+
+def save_web_description(museum, external_id, description):
+    """Store a scraped website description for a painting. Returns True if a row was updated."""
+    client = get_client()
+    try:
+        result = (client.table("paintings")
+                  .update({
+                      "web_description": description,
+                      "web_description_fetched_at": datetime.utcnow().isoformat()
+                  })
+                  .eq("museum", museum)
+                  .eq("external_id", external_id)
+                  .execute())
+        return bool(result.data)
+    except Exception as e:
+        print(f"Error saving web description: {e}")
+        return False
+
+
+def get_paintings_missing_web_description(museum, limit=100):
+    """Get paintings whose website description has not been scraped yet."""
+    client = get_client()
+    try:
+        result = (client.table("paintings")
+                  .select("external_id, museum_url")
+                  .eq("museum", museum)
+                  .is_("web_description_fetched_at", "null")
+                  .limit(limit)
+                  .execute())
+        return result.data or []
+    except Exception as e:
+        print(f"Error getting paintings missing web description: {e}")
+        return []
+
+
 def get_random_painting():
     """Get a random painting from the database."""
     client = get_client()
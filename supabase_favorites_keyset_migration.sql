@@ -0,0 +1,9 @@
+-- Favorites pagination migration
+-- Run this in the Supabase SQL Editor
+--
+-- /api/favorites pages through a user's favorites newest first, keyed on
+-- (created_at, id). This index serves each page as a short range scan, so
+-- later pages cost the same as the first.
+
+CREATE INDEX IF NOT EXISTS idx_favorites_user_created
+    ON favorites(user_id, created_at DESC, id DESC);
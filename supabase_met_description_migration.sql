@@ -0,0 +1,14 @@
+-- Met description enrichment migration
+-- Run this in the Supabase SQL Editor
+--
+-- The Met API doesn't include curatorial descriptions, so they are scraped
+-- from metmuseum.org once per object by a background job and stored here.
+-- Kept separate from `description` so re-harvesting doesn't overwrite it.
+
+ALTER TABLE paintings ADD COLUMN IF NOT EXISTS web_description TEXT;
+ALTER TABLE paintings ADD COLUMN IF NOT EXISTS web_description_fetched_at TIMESTAMPTZ;
+
+-- Find paintings still waiting for enrichment
+CREATE INDEX IF NOT EXISTS idx_paintings_web_description_pending
+    ON paintings(museum)
+    WHERE web_description_fetched_at IS NULL;